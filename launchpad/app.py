@@ -1,42 +1,139 @@
 """Controller: owns runtime state and the MIDI event loop.
 
-Wires together the config model, HAClient, MidiSurface, and preset dispatch.
+Wires together the config model, HAClient, one Surface per attached
+Launchpad, and preset dispatch (through PresetHost, so a preset never runs
+on the MIDI input path). All surfaces share the HA client, its state store,
+the scheduler and the preset host.
 Preserves the daemon's core behaviors: passive-mode safety, USB hot-plug
 resilience (no exception escapes the loop), optimistic LED updates, and
 rate-limited pad repaints.
+
+This is the default threaded runtime. `launchpad.reactor.AsyncController`
+is an optional single-event-loop runtime over the same Controller logic,
+selected with "launchpad_runtime": "asyncio" in settings.json.
 """
 
 from __future__ import annotations
 
-import importlib
 import signal
 import sys
+import threading
 import time
+from functools import partial
 from pathlib import Path
 
-from .config import Config, Room, load_config
-from .ha_client import HAClient
-from .midi import MidiSurface
-from .presets_api import PresetHA
-from .settings import get_credentials
-
-# entity states that count as "lit" for LED purposes
-ON_STATES = ("on", "cool")
+from .compositor import Canvas, Look
+from .config import (
+    Action,
+    Config,
+    PadLook,
+    Room,
+    load_config,
+    read_config,
+    save_config,
+)
+from .control import ControlServer
+from .device import LED_MODES, RGB, STATIC, pack_rgb
+from .frames import FrameCache
+from .ha_client import PENDING_TIMEOUT, HAClient
+from .latency import LatencyTracer, Trace
+from .layout import LAYOUT_PATH, Event, load_layout, read_layout
+from .metrics import METRICS_INTERVAL, MetricsExporter
+from .palette import build_lut, nearest
+from .preset_host import PresetHost
+from .ratecontrol import ADJUST_INTERVAL, RateController
+from .scheduler import Scheduler
+from .settings import (
+    color_mirror,
+    get_credentials,
+    led_frame_rate,
+    metrics_file,
+    runtime,
+    sysex_frames,
+    usb_message_budget,
+)
+from .state_store import ON_STATES, UNAVAILABLE_STATES
+from .surface import Surface, build_surfaces, rooms_for
 
 # minimum seconds between full pad repaints (~12.5 Hz)
 PAD_REFRESH_INTERVAL = 0.08
 
+# brief white blink on a preset pad to acknowledge the press
+PRESS_FEEDBACK_COLOR = 3
+
+# seconds between reconnect attempts for an unplugged surface
+HOTPLUG_RETRY = 1.0
+
+# seconds between config.json / layout.json change checks
+RELOAD_INTERVAL = 1.0
+
+# seconds preset cleanups (and the HA calls they make) get at shutdown
+SHUTDOWN_GRACE = 2.0
+
+# LED mode names on the control socket ("rgb" pads carry 0xRRGGBB colors)
+MODE_NAMES = {mode: name for name, mode in LED_MODES.items()} | {RGB: "rgb"}
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 CONFIG_PATH = PROJECT_ROOT / "config.json"
 
 
+def _mtime(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
 class Controller:
-    def __init__(self, config: Config, ha: HAClient, midi: MidiSurface):
+    def __init__(self, config: Config, ha: HAClient):
         self.config = config
         self.ha = ha
-        self.midi = midi
-        self.active_room: Room = config.rooms[0]
-        self.preset_ha = PresetHA(ha)
+        self.layout = load_layout()
+        self.scheduler = Scheduler()
+        self.surfaces: list[Surface] = build_surfaces(
+            config,
+            self.scheduler,
+            fps=led_frame_rate(),
+            budget=usb_message_budget(),
+            sysex_frames=sysex_frames(),
+        )
+        self.rate = RateController(ha)
+        self.scheduler.every(ADJUST_INTERVAL, self.rate.adjust)
+        self.presets = PresetHost(
+            ha,
+            self.scheduler,
+            rate=self.rate,
+            canvas=lambda: Canvas(
+                [s.compositor for s in self.surfaces], self.layout
+            ),
+        )
+        self.presets.on_change = self._presets_changed
+        self.color_mirror = color_mirror()
+        if self.color_mirror != "off":
+            build_lut()  # pay for the table now, not on the first event
+        self.frames = FrameCache(config.rooms, self._action_look, self._action_lit)
+        ha.states.on_change = self.frames.touch
+        self.latency = LatencyTracer()
+        ha.on_state_event = self.latency.confirmed
+        for surface in self.surfaces:
+            surface.compositor.on_sent = partial(self.latency.led_sent, surface.name)
+        self.repaints = 0
+        self.loop_iterations = 0
+        self.loop_seconds = 0.0
+        self.loop_max = 0.0
+        # set by the SIGUSR1 handler; the main loop prints the report, since
+        # the handler may interrupt that thread while it holds the tracer's
+        # (or the scheduler's) lock
+        self.report_requested = False
+        self.metrics = MetricsExporter(self, metrics_file())
+        self.scheduler.every(METRICS_INTERVAL, self.metrics.sample)
+        self.control = ControlServer(
+            self.control_handlers(), self.scheduler, streams=self.control_streams()
+        )
+        # held while room tables are swapped, so input never sees half a config
+        self._tables = threading.RLock()
+        self._mtimes = {CONFIG_PATH: _mtime(CONFIG_PATH), LAYOUT_PATH: _mtime(LAYOUT_PATH)}
+        self.scheduler.every(RELOAD_INTERVAL, self._check_files)
         self._last_update = 0.0
 
     # ---- LED painting --------------------------------------------------
@@ -44,78 +141,468 @@ class Controller:
     def _entity_on(self, entity_id: str) -> bool:
         return self.ha.state(entity_id) in ON_STATES
 
+    def _action_lit(self, act: Action) -> bool:
+        return any(self._entity_on(e) for e in act.entity_ids or ())
+
+    def _action_look(self, act: Action) -> Look:
+        if act.entity_ids is None:
+            if act.running and act.preset and self.presets.is_running(act.preset):
+                return self._styled(act.running, act.on_color)
+            return (act.on_color, STATIC)
+
+        on = any(self._entity_on(e) for e in act.entity_ids)
+        color = act.on_color if on else act.off_color
+        rgb = self._mirrored_rgb(act.entity_ids) if on else None
+        if rgb is not None:
+            color = nearest(rgb)
+        if act.pending and any(self.ha.states.is_pending(e) for e in act.entity_ids):
+            return self._styled(act.pending, color)
+        if act.unavailable and act.entity_ids and all(
+            self.ha.state(e) in UNAVAILABLE_STATES for e in act.entity_ids
+        ):
+            return self._styled(act.unavailable, act.off_color)
+        if rgb is not None and self.color_mirror == "sysex":
+            return (pack_rgb(rgb), RGB)
+        return (color, STATIC)
+
+    def _mirrored_rgb(self, entity_ids: list[str]) -> tuple[int, int, int] | None:
+        """`rgb_color` of the first lit entity that has one, if mirroring."""
+        if self.color_mirror == "off":
+            return None
+        for e in entity_ids:
+            if not self._entity_on(e):
+                continue
+            rgb = self.ha.states.get(e, {}).get("attributes", {}).get("rgb_color")
+            if rgb and len(rgb) == 3:
+                return tuple(rgb)
+        return None
+
+    @staticmethod
+    def _styled(look: PadLook, color: int) -> Look:
+        return (
+            color if look.color is None else look.color,
+            LED_MODES.get(look.mode, STATIC),
+        )
+
     def update_pads(self) -> None:
         if time.time() - self._last_update < PAD_REFRESH_INTERVAL:
             return
         self._last_update = time.time()
-
-        # top-row room selectors: lit if any entity in the room is on
-        for room in self.config.rooms:
-            any_on = any(
-                a.entity_ids
-                and any(self._entity_on(e) for e in a.entity_ids)
-                for a in room.actions
-            )
-            self.midi.set_pad(
-                room.room_key,
-                room.room_key_color_any_on if any_on else room.room_key_color_off,
-                True,
-            )
-
-        # active room grid
-        for act in self.active_room.actions:
-            if act.entity_ids is None:
-                self.midi.set_pad(act.key, act.on_color, False)
-            else:
-                on = any(self._entity_on(e) for e in act.entity_ids)
-                self.midi.set_pad(
-                    act.key, act.on_color if on else act.off_color, False
-                )
+        self.paint_pads()
+
+    def paint_pads(self) -> None:
+        """Hand every surface its current base frame (no rate limiting).
+
+        Frames come from the FrameCache, which re-renders only pads whose
+        entities changed. The compositor pushes only the pads that differ;
+        pads of the previously shown room page that this one doesn't use
+        go dark.
+        """
+        self.repaints += 1
+        for surface in self.surfaces:
+            self._paint_surface(surface)
+
+    def _paint_surface(self, surface: Surface) -> None:
+        surface.compositor.replace(
+            "base", self._page_frame(surface.rooms, surface.active_room, surface.page)
+        )
+
+    def _page_frame(self, rooms: list[Room], room: Room, page: int) -> dict[Event, Look]:
+        """Base frame of a surface with `rooms` showing `room`/`page`."""
+        frame: dict[Event, Look] = {
+            (True, r.room_key): self.frames.selector(r) for r in rooms
+        }
+        frame.update(self.frames.frame(room, page))
+        return frame
+
+    def _presets_changed(self) -> None:
+        self.frames.touch_presets()
+        self.paint_pads()
+
+    def _expire_pending(self, entity_ids: list[str]) -> None:
+        # nothing is written when a pending look times out; re-render it
+        for e in entity_ids:
+            self.frames.touch(e)
+        self.paint_pads()
 
     # ---- preset dispatch ----------------------------------------------
 
     def run_preset(self, name: str) -> None:
-        try:
-            importlib.import_module(f"presets.{name}").run(self.preset_ha)
-        except Exception as e:
-            print(f"❌ Preset error [{name}]: {e}")
+        # returns at once: the host runs the preset on the scheduler
+        self.presets.press(name)
 
     # ---- input handling ------------------------------------------------
 
-    def _handle_message(self, msg) -> None:
+    def _handle_message(self, surface: Surface, msg, t0: float | None = None) -> None:
+        """Act on one MIDI message; `t0` is when it was received (now if
+        None), the start of the press's latency trace."""
+        if t0 is None:
+            t0 = time.monotonic()
+        with self._tables:
+            self._dispatch_message(surface, msg, t0)
+
+    def _dispatch_message(self, surface: Surface, msg, t0: float | None = None) -> None:
         if msg.type == "control_change":
-            for room in self.config.rooms:
+            for room in surface.rooms:
                 if room.room_key == msg.control:
-                    self.active_room = room
-                    self.update_pads()
+                    self._switch_room(surface, room)
+                    return
             return
 
         if msg.type == "note_on" and msg.velocity > 0:
-            for act in self.active_room.actions:
-                if msg.note != act.key:
-                    continue
-
-                if act.is_preset:
-                    self.run_preset(act.preset)
-                    self.update_pads()
-                    return
+            act = self.frames.action_at(surface.active_room, surface.page, msg.note)
+            if act is not None:
+                self._press(surface, act, t0)
+
+    def _press(self, surface: Surface | None, act: Action, t0: float | None = None) -> None:
+        if act.is_preset:
+            if surface is not None:
+                surface.compositor.flash((False, act.key), PRESS_FEEDBACK_COLOR)
+                surface.compositor.flush()
+            self.run_preset(act.preset)
+            self.update_pads()
+            return
 
-                self._toggle(act.entity_ids)
-                self.update_pads()
-                return
+        trace = None
+        if t0 is not None:
+            trace = self.latency.begin(
+                act.entity_ids, t0,
+                surface.name if surface is not None else None, (False, act.key),
+            )
+        self._toggle(act.entity_ids, trace)
+        # optimistic feedback goes out now: past the repaint rate limit and
+        # without waiting for the next compositor frame
+        self.paint_pads()
+        for s in self.surfaces:
+            s.compositor.flush()
+        if act.pending:
+            # HA may never confirm; drop the pending look by then
+            self.scheduler.call_later(
+                PENDING_TIMEOUT, self._expire_pending, act.entity_ids
+            )
 
-    def _toggle(self, entity_ids: list[str]) -> None:
+    def _switch_room(self, surface: Surface, room: Room) -> None:
+        """Select a room, or step to its next page if it's already active.
+
+        The target frame is already rendered, so this is a dict merge and
+        one immediate compositor frame.
+        """
+        if room is surface.active_room:
+            surface.page = (surface.page + 1) % room.pages
+        else:
+            surface.active_room = room
+            surface.page = 0
+        self._paint_surface(surface)
+        surface.compositor.flush()
+
+    def _toggle(self, entity_ids: list[str], trace: Trace | None = None) -> None:
         turning_on = not any(self._entity_on(e) for e in entity_ids)
         state = "on" if turning_on else "off"
         svc = "turn_on" if turning_on else "turn_off"
+        progress = partial(self.latency.call_progress, trace) if trace else None
         for e in entity_ids:
             self.ha.set_local(e, state)
-            self.ha.call(e.split(".")[0], svc, {"entity_id": e})
+            self.ha.call(e.split(".")[0], svc, {"entity_id": e}, progress)
+
+    # ---- config --------------------------------------------------------
+
+    def apply_config(self, config: Config) -> None:
+        """Swap in a new config without touching HA or MIDI connections.
+
+        The room tables are replaced under the input lock, so a press sees
+        either the old config or the new one; the repaint pushes only pads
+        that changed. Surfaces keep their room (by name) and page; devices
+        are matched by name, so port changes and added devices need a
+        restart.
+        """
+        if not config.rooms:
+            raise ValueError("config has no rooms")
+        devices = {d.name: d for d in config.devices}
+        with self._tables:
+            for surface in self.surfaces:
+                dev = devices.get(surface.name, surface.device)
+                rooms = rooms_for(config, dev) or config.rooms
+                surface.device = dev
+                surface.bind(rooms)
+            self.config = config
+            self.frames.rebuild(config.rooms)
+        if {d.name for d in config.devices} - {s.name for s in self.surfaces}:
+            print("🔄 New devices in config: restart the daemon to attach them")
+        self.paint_pads()
+
+    def _check_files(self) -> None:
+        """Apply edits to config.json / layout.json while connections stay up.
+
+        A file that fails to parse or validate is reported and skipped; the
+        daemon keeps running on what it has until the next good write.
+        """
+        for path, reload in (
+            (CONFIG_PATH, self._reload_config),
+            (LAYOUT_PATH, self._reload_layout),
+        ):
+            mtime = _mtime(path)
+            if mtime is None or mtime == self._mtimes.get(path):
+                continue
+            self._mtimes[path] = mtime
+            try:
+                reload(path)
+            except Exception as e:
+                print(f"❌ {path.name} not applied: {e}")
+
+    def _reload_config(self, path: Path) -> None:
+        config = read_config(path)
+        if config == self.config:
+            return
+        self.apply_config(config)
+        print(f"🔄 Config reloaded ({len(config.rooms)} rooms)")
+
+    def _reload_layout(self, path: Path) -> None:
+        self.layout = read_layout(path)  # canvases created from now on use it
+        print("🔄 Layout reloaded")
+
+    # ---- control socket ------------------------------------------------
+
+    def control_handlers(self) -> dict:
+        return {
+            "ping": lambda args: {},
+            "status": self._cmd_status,
+            "states": self._cmd_states,
+            "room": self._cmd_room,
+            "trigger": self._cmd_trigger,
+            "preview": self._cmd_preview,
+            "config": self._cmd_config,
+            "metrics": self._cmd_metrics,
+            "prometheus": lambda args: {"text": self.metrics.text()},
+            "frame": lambda args: {"pads": self._pads_out(self._frame_arg(args).items())},
+        }
+
+    def control_streams(self) -> dict:
+        return {"frame": self._follow_frame}
+
+    def _surface_arg(self, args: dict) -> list[Surface]:
+        name = args.get("surface")
+        if name is None:
+            return self.surfaces
+        found = [s for s in self.surfaces if s.name == name]
+        if not found:
+            raise ValueError(f"no surface {name!r}")
+        return found
+
+    def _room_arg(self, args: dict) -> Room:
+        room = next((r for r in self.config.rooms if r.name == args.get("room")), None)
+        if room is None:
+            raise ValueError(f"no room {args.get('room')!r}")
+        return room
+
+    def _cmd_status(self, args: dict) -> dict:
+        return {
+            "surfaces": [
+                {
+                    "name": s.name,
+                    "connected": s.connected,
+                    "port": s.midi.in_name,
+                    "room": s.active_room.name,
+                    "page": s.page,
+                    "rooms": [r.name for r in s.rooms],
+                }
+                for s in self.surfaces
+            ],
+            "presets": self.presets.running(),
+            "passive": self.ha.passive,
+        }
+
+    def _cmd_states(self, args: dict) -> dict:
+        # `since` (a previous reply's seq) returns only what changed after
+        # it, removed entities as null; `entities` filters to those IDs.
+        store = self.ha.states
+        seq, changed = store.changed_since(int(args.get("since", 0)))
+        domain = args.get("domain")
+        if changed is None:
+            ids = store.domain(domain) if domain else list(store)
+        else:
+            ids = [e for e in changed if not domain or e.split(".", 1)[0] == domain]
+        if args.get("entities") is not None:
+            wanted = set(args["entities"])
+            ids = [e for e in ids if e in wanted]
+        areas = {e: a for e in ids if (a := store.area_of(e))}
+        return {
+            "states": {e: store.get(e) for e in ids},
+            "areas": areas,
+            "seq": seq,
+            "full": changed is None,
+        }
+
+    # room/trigger run on the scheduler thread: they take the input lock,
+    # like a pad press, so they never interleave with one
+
+    def _cmd_room(self, args: dict) -> dict:
+        with self._tables:
+            room = self._room_arg(args)
+            for surface in self._surface_arg(args):
+                if room not in surface.rooms:
+                    continue
+                surface.active_room = room
+                surface.page = max(0, min(int(args.get("page", 0)), room.pages - 1))
+                self._paint_surface(surface)
+                surface.compositor.flush()
+        return self._cmd_status(args)
+
+    def _cmd_trigger(self, args: dict) -> dict:
+        with self._tables:
+            room = self._room_arg(args)
+            act = self.frames.action_at(room, int(args.get("page", 0)), int(args["key"]))
+            if act is None:
+                raise ValueError(f"no action on pad {args['key']} in {room.name!r}")
+            surface = next((s for s in self.surfaces if s.active_room is room), None)
+            self._press(surface, act)
+        return {}
+
+    @staticmethod
+    def _pad_arg(pad: dict) -> tuple[Event, Look | None]:
+        key = (bool(pad.get("is_cc", False)), int(pad["key"]))
+        if pad.get("color") is None:
+            return key, None
+        return key, (int(pad["color"]), LED_MODES.get(pad.get("mode", "static"), STATIC))
+
+    def _cmd_preview(self, args: dict) -> dict:
+        """Show pads {key, color, is_cc?, mode?} above the room.
+
+        `frame` replaces the held preview layer (an empty one clears it);
+        `patch` changes only the pads given, a null color dropping one.
+        Otherwise `pads` (or one pad's fields inline) flash on the feedback
+        layer for `duration` seconds.
+        """
+        surfaces = self._surface_arg(args)
+        if "frame" in args:
+            frame = dict(self._pad_arg(p) for p in args["frame"])
+            for surface in surfaces:
+                surface.compositor.replace("preview", frame)
+            return {}
+        if "patch" in args:
+            changes = [self._pad_arg(p) for p in args["patch"]]
+            for surface in surfaces:
+                for key, look in changes:
+                    if look is None:
+                        surface.compositor.clear("preview", key)
+                    else:
+                        surface.compositor.set("preview", key, *look)
+            return {}
+        duration = float(args.get("duration", 1.0))
+        for surface in surfaces:
+            for pad in args.get("pads") or [args]:
+                key, (color, mode) = self._pad_arg(pad)
+                surface.compositor.flash(key, color, duration, mode)
+        return {}
+
+    def _cmd_config(self, args: dict) -> dict:
+        config = Config.from_dict(args["config"])
+        self.apply_config(config)
+        if args.get("save", True):
+            save_config(config, CONFIG_PATH)
+            self._mtimes[CONFIG_PATH] = _mtime(CONFIG_PATH)  # not a new edit
+        return {"rooms": len(config.rooms)}
+
+    def _frame_arg(self, args: dict) -> dict[Event, Look]:
+        # the daemon's own rendering of `room`/`page`, with the selectors
+        # of the surface (`surface`, else the first) that holds the room
+        with self._tables:
+            room = self._room_arg(args)
+            holders = [s for s in self._surface_arg(args) if room in s.rooms]
+            rooms = holders[0].rooms if holders else self.config.rooms
+            return self._page_frame(rooms, room, int(args.get("page", 0)))
+
+    @staticmethod
+    def _pads_out(pads) -> list[dict]:
+        """Control-socket form of (key, look) pairs; a None look is "off"."""
+        return [
+            {"key": n, "is_cc": is_cc, "color": None, "mode": None} if look is None
+            else {"key": n, "is_cc": is_cc, "color": look[0],
+                  "mode": MODE_NAMES.get(look[1], "static")}
+            for (is_cc, n), look in pads
+        ]
+
+    def _follow_frame(self, args: dict):
+        """Stream for `frame`: the whole page first ("full"), then only the
+        pads whose look changed, a null color for pads that went away."""
+        shown: dict[Event, Look] | None = None
+
+        def update() -> dict | None:
+            nonlocal shown
+            frame = self._frame_arg(args)
+            if shown is None:
+                shown = frame
+                return {"pads": self._pads_out(frame.items()), "full": True}
+            changed = [(k, v) for k, v in frame.items() if shown.get(k) != v]
+            changed += [(k, None) for k in shown.keys() - frame.keys()]
+            shown = frame
+            if not changed:
+                return None
+            return {"pads": self._pads_out(changed), "full": False}
+
+        return update
+
+    def _cmd_metrics(self, args: dict) -> dict:
+        return {
+            "rate": self.rate.status(),
+            "presets": self.presets.status(),
+            "latency": self.latency.report(),
+            "surfaces": {
+                s.name: {
+                    "connected": s.connected,
+                    "sent": s.compositor.sent,
+                    "suppressed": s.compositor.suppressed,
+                }
+                for s in self.surfaces
+            },
+        }
 
     # ---- main loop -----------------------------------------------------
 
+    def _connect(self, surface: Surface, callback=None) -> bool:
+        """Try to (re)open a surface's ports; repaint it fully once it's up."""
+        surface.next_attempt = time.monotonic() + HOTPLUG_RETRY
+        if not surface.midi.try_open(callback):
+            return False
+        surface.connected = True
+        surface.connects += 1
+        surface.compositor.invalidate()
+        self.update_pads()
+        return True
+
+    def _loop_busy(self, busy: float) -> None:
+        """Count one main-loop iteration that did `busy` seconds of work."""
+        self.loop_iterations += 1
+        self.loop_seconds += busy
+        if busy > self.loop_max:
+            self.loop_max = busy
+
+    def _disconnect(self, surface: Surface) -> None:
+        surface.connected = False
+        surface.midi.close()
+        print(f"🔌 Disconnected: {surface.name}")
+
+    def shutdown(self) -> None:
+        """Stop presets and let their cleanups (lights off) reach HA, then close."""
+        deadline = time.monotonic() + SHUTDOWN_GRACE
+        self.presets.stop_all()
+        done = threading.Event()
+        self.scheduler.call_soon(done.set)  # after the queued cleanups
+        done.wait(SHUTDOWN_GRACE)
+        self.ha.wait_idle(max(0.0, deadline - time.monotonic()))
+        self.close()
+
+    def close(self) -> None:
+        self.control.close()
+        for surface in self.surfaces:
+            surface.midi.close()
+
     def run(self) -> None:
-        self.midi.open()
+        self.scheduler.start_thread()
+        self.presets.registry.preload()
+        self.control.start()
+        for surface in self.surfaces:
+            if not self._connect(surface):
+                print(f"⏳ Waiting for Launchpad: {surface.name}")
         self.ha.refresh_states(force=True)
         self.ha.start_ws(self.update_pads)
 
@@ -123,28 +610,43 @@ class Controller:
         self.update_pads()
 
         while True:
-            if not self.midi.still_present():
-                self.midi.open()
-                self.update_pads()
-
-            for msg in self.midi.iter_pending():
-                self._handle_message(msg)
+            start = time.monotonic()
+            for surface in self.surfaces:
+                if not surface.connected:
+                    if time.monotonic() >= surface.next_attempt:
+                        self._connect(surface)
+                    continue
+                if not surface.midi.still_present():
+                    self._disconnect(surface)
+                    continue
+                for msg in surface.midi.iter_pending():
+                    self._handle_message(surface, msg)
 
+            self._loop_busy(time.monotonic() - start)
+            if self.report_requested:
+                self.report_requested = False
+                self.latency.print_report()
             time.sleep(0.01)
 
 
 def main() -> None:
     url, token = get_credentials()
     ha = HAClient(url, token)
-    midi = MidiSurface()
-    controller = Controller(load_config(CONFIG_PATH), ha, midi)
+    if runtime() == "asyncio":
+        from .reactor import AsyncController
+
+        AsyncController(load_config(CONFIG_PATH), ha).run()
+        return
+    controller = Controller(load_config(CONFIG_PATH), ha)
 
     def shutdown(sig, frame):
         print("🛑 Shutting down...")
-        midi.close()
+        controller.shutdown()
         sys.exit(0)
 
     signal.signal(signal.SIGTERM, shutdown)
     signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGUSR1,
+                  lambda sig, frame: setattr(controller, "report_requested", True))
 
     controller.run()
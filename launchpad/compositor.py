@@ -0,0 +1,239 @@
+"""Layered pad frame compositor on top of MidiSurface.
+
+Pads are addressed by event `(is_cc, number)` (see layout.py) and hold a
+look `(color, mode)`, mode being device.STATIC / FLASH / PULSE; layer
+writes may pass a bare color for a static pad. Four layers are stacked
+bottom to top:
+
+    base      state-driven colors painted by the Controller
+    preset    overlay drawn by running presets (through a `Canvas`)
+    preview   the manage GUI's held page preview (control `preview`)
+    feedback  short-lived press feedback (`flash`)
+
+A pad shows the top-most layer that sets it, or off when none does. Writes
+only mark pads dirty; the mix is pushed at a fixed frame rate, and only for
+pads whose composited color differs from what the device already shows.
+At most `budget` messages go out per second (spread evenly over frames);
+pads over budget stay dirty and go in the next frame, so a burst of changes
+never floods the USB link. Frames are scheduled only while something is
+dirty, so an idle surface costs nothing. `flush()` pushes everything
+pending at once, budget aside (a room switch is one frame, not several),
+and each frame goes to the device through one `MidiSurface.set_pads` call,
+which can pack it into a single SysEx.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Callable
+
+from .device import STATIC
+from .layout import GRID, Event, Layout
+
+if TYPE_CHECKING:  # annotations only; keeps mido/asyncio out of the GUI
+    from .midi import MidiSurface
+    from .scheduler import Scheduler, TimerHandle
+
+LAYERS = ("base", "preset", "preview", "feedback")
+
+FPS = 25
+MSG_BUDGET = 1000  # MIDI messages per second
+
+Look = tuple[int, int]  # (palette color, LED mode)
+OFF: Look = (0, STATIC)
+
+
+def _look(value: "int | Look") -> Look:
+    return value if isinstance(value, tuple) else (value, STATIC)
+
+
+class FrameCompositor:
+    def __init__(
+        self,
+        midi: MidiSurface,
+        scheduler: Scheduler,
+        fps: int = FPS,
+        budget: int = MSG_BUDGET,
+    ):
+        self.midi = midi
+        self.scheduler = scheduler
+        self.frame_interval = 1.0 / max(1, fps)
+        self.per_frame = max(1, budget // max(1, fps))
+        self.layers: dict[str, dict[Event, Look]] = {name: {} for name in LAYERS}
+        self._shown: dict[Event, Look] = {}
+        self._dirty: dict[Event, None] = {}  # insertion-ordered set
+        self._lock = threading.Lock()
+        self._tick_pending = False
+        self._tick_timer = None
+        self._flashes: dict[Event, tuple[object, TimerHandle]] = {}  # pending clears
+        self.sent = 0
+        self.suppressed = 0
+        # hears the keys of every frame that reached the device
+        self.on_sent: Callable[[list[Event]], None] | None = None
+
+    @property
+    def backlog(self) -> int:
+        """Pads waiting for a frame (over budget or not yet ticked)."""
+        return len(self._dirty)
+
+    # ---- layer writes --------------------------------------------------
+
+    def set(self, layer: str, key: Event, color: int, mode: int = STATIC) -> None:
+        look = (color, mode)
+        with self._lock:
+            cells = self.layers[layer]
+            if cells.get(key) == look:
+                return
+            cells[key] = look
+            self._mark(key)
+
+    def clear(self, layer: str, key: Event) -> None:
+        with self._lock:
+            if self.layers[layer].pop(key, None) is not None:
+                self._mark(key)
+
+    def replace(self, layer: str, frame: "dict[Event, int | Look]") -> None:
+        """Swap a whole layer; only pads that actually change are marked."""
+        new = {key: _look(v) for key, v in frame.items()}
+        with self._lock:
+            old = self.layers[layer]
+            for key in old.keys() - new.keys():
+                self._mark(key)
+            for key, look in new.items():
+                if old.get(key) != look:
+                    self._mark(key)
+            self.layers[layer] = new
+
+    def flash(self, key: Event, color: int, duration: float = 0.15,
+              mode: int = STATIC) -> None:
+        """Show `color` on a pad for `duration` seconds above everything.
+
+        A daemon-timed blink; for a steady device-side flash set a layer
+        cell with mode=device.FLASH instead. Flashing a pad again restarts
+        its timer rather than letting the earlier one cut the new flash short.
+        """
+        self.set("feedback", key, color, mode)
+        token = object()
+        with self._lock:
+            old = self._flashes.get(key)
+            if old is not None:
+                old[1].cancel()
+            timer = self.scheduler.call_later(duration, self._unflash, key, token)
+            self._flashes[key] = (token, timer)
+
+    def _unflash(self, key: Event, token: object) -> None:
+        with self._lock:
+            current = self._flashes.get(key)
+            if current is None or current[0] is not token:
+                return  # re-flashed since; a newer timer owns the pad
+            del self._flashes[key]
+            if self.layers["feedback"].pop(key, None) is not None:
+                self._mark(key)
+
+    def flush(self) -> None:
+        """Push all pending changes now as one frame, over budget if need be."""
+        with self._lock:
+            if self._tick_timer is not None:
+                self._tick_timer.cancel()
+            self._tick_pending = True
+            self._tick_timer = self.scheduler.call_soon(self.tick, True)
+
+    def invalidate(self) -> None:
+        """Forget what the device shows (e.g. after re-plug) and repaint."""
+        with self._lock:
+            self._shown.clear()
+            for cells in self.layers.values():
+                for key in cells:
+                    self._mark(key)
+
+    # ---- frame push ----------------------------------------------------
+
+    def _mark(self, key: Event) -> None:
+        # caller holds the lock
+        self._dirty[key] = None
+        if not self._tick_pending:
+            self._tick_pending = True
+            self._tick_timer = self.scheduler.call_later(self.frame_interval, self.tick)
+
+    def _composite(self, key: Event) -> Look:
+        for name in reversed(LAYERS):
+            look = self.layers[name].get(key)
+            if look is not None:
+                return look
+        return OFF
+
+    def tick(self, whole: bool = False) -> None:
+        with self._lock:
+            self._tick_pending = False
+            self._tick_timer = None
+            batch = []
+            for key in list(self._dirty):
+                look = self._composite(key)
+                if key in self._shown and self._shown[key] == look:
+                    self.suppressed += 1
+                    del self._dirty[key]
+                    continue
+                if len(batch) >= self.per_frame and not whole:
+                    break
+                batch.append((key, look))
+                del self._dirty[key]
+            if self._dirty:  # over budget: carry the rest to the next frame
+                self._tick_pending = True
+                self._tick_timer = self.scheduler.call_later(
+                    self.frame_interval, self.tick
+                )
+
+        if not batch:
+            return
+        try:
+            self.midi.set_pads(batch)
+        except Exception:
+            # device went away mid-frame; resend once it is back
+            with self._lock:
+                for key, _ in batch:
+                    self._shown.pop(key, None)
+            return
+        with self._lock:
+            self._shown.update(batch)
+        self.sent += len(batch)
+        if self.on_sent is not None:
+            self.on_sent([key for key, _ in batch])
+
+
+class Canvas:
+    """A preset's drawing surface: grid cells on the compositor's preset layer.
+
+    Cells are (row, col) in the manage GUI's 9x9 grid (row 0 = top CC row)
+    and are mapped to real pads through the daemon's Layout. With several
+    Launchpads attached, the drawing is mirrored on every surface. Everything
+    a canvas drew is removed by `clear()`, which the preset host calls when
+    the preset ends.
+    """
+
+    size = GRID
+
+    def __init__(self, compositors: list[FrameCompositor], layout: Layout):
+        self._compositors = compositors
+        self._layout = layout
+        self._keys: set[Event] = set()
+
+    def set(self, row: int, col: int, color: int, mode: int = STATIC) -> None:
+        key = self._layout.key_for_cell(row, col)
+        if key is None:
+            return
+        self._keys.add(key)
+        for compositor in self._compositors:
+            compositor.set("preset", key, color, mode)
+
+    def erase(self, row: int, col: int) -> None:
+        key = self._layout.key_for_cell(row, col)
+        if key in self._keys:
+            self._keys.discard(key)
+            for compositor in self._compositors:
+                compositor.clear("preset", key)
+
+    def clear(self) -> None:
+        for key in self._keys:
+            for compositor in self._compositors:
+                compositor.clear("preset", key)
+        self._keys.clear()
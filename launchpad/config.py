@@ -4,6 +4,24 @@ An Action is either an *entity* action (`entity_ids` set — toggles Home
 Assistant entities) or a *preset* action (`preset` set — dispatches to a
 `presets/<name>.py` module). `service_data` is preserved from JSON but the
 runtime does not currently apply it (matches historical behavior).
+
+An Action may also give its pad a distinct look for three transient states,
+each a PadLook (`{"mode": "flash"|"pulse"|"static", "color": n}`, or just the
+mode string); the Launchpad animates flash/pulse itself:
+
+    pending      a toggle was sent and HA hasn't confirmed it yet
+    unavailable  every entity of the action reports "unavailable"
+    running      the action's preset is running
+
+Left unset, the pad keeps its plain on/off colors.
+
+A room may span several pages of grid pads: an Action's `page` (default 0)
+picks which one it sits on, and pressing the active room's selector again
+steps to its next page.
+
+`devices` (optional) drives several Launchpads from one daemon: each entry
+picks its MIDI port by a name substring and lists the rooms it serves. With
+no `devices`, the first Launchpad found serves every room.
 """
 
 from __future__ import annotations
@@ -12,6 +30,28 @@ import json
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from .storage import backup_path, read_json, write_json
+
+
+@dataclass
+class PadLook:
+    mode: str = "static"  # static | flash | pulse
+    color: int | None = None  # None: the color the pad would show anyway
+
+    @classmethod
+    def from_dict(cls, d: "dict | str | None") -> "PadLook | None":
+        if d is None:
+            return None
+        if isinstance(d, str):
+            return cls(mode=d)
+        return cls(mode=d.get("mode", "static"), color=d.get("color"))
+
+    def to_dict(self) -> dict:
+        d: dict = {"mode": self.mode}
+        if self.color is not None:
+            d["color"] = self.color
+        return d
+
 
 @dataclass
 class Action:
@@ -21,6 +61,10 @@ class Action:
     entity_ids: list[str] | None = None
     preset: str | None = None
     service_data: dict | None = None
+    pending: PadLook | None = None
+    unavailable: PadLook | None = None
+    running: PadLook | None = None
+    page: int = 0
 
     @property
     def is_preset(self) -> bool:
@@ -35,10 +79,16 @@ class Action:
             entity_ids=d.get("entity_ids"),
             preset=d.get("preset"),
             service_data=d.get("service_data"),
+            pending=PadLook.from_dict(d.get("pending")),
+            unavailable=PadLook.from_dict(d.get("unavailable")),
+            running=PadLook.from_dict(d.get("running")),
+            page=d.get("page", 0),
         )
 
     def to_dict(self) -> dict:
         d: dict = {"key": self.key}
+        if self.page:
+            d["page"] = self.page
         if self.entity_ids is not None:
             d["entity_ids"] = self.entity_ids
         if self.preset is not None:
@@ -47,6 +97,10 @@ class Action:
             d["service_data"] = self.service_data
         d["on_color"] = self.on_color
         d["off_color"] = self.off_color
+        for name in ("pending", "unavailable", "running"):
+            look = getattr(self, name)
+            if look is not None:
+                d[name] = look.to_dict()
         return d
 
 
@@ -59,6 +113,10 @@ class Room:
     room_key_color_off: int = 5
     room_key_color_on: int = 21  # present in JSON; not used by pad logic
 
+    @property
+    def pages(self) -> int:
+        return max((a.page for a in self.actions), default=0) + 1
+
     @classmethod
     def from_dict(cls, d: dict) -> "Room":
         return cls(
@@ -81,12 +139,42 @@ class Room:
         }
 
 
+@dataclass
+class Device:
+    name: str
+    port: str | None = None  # case-insensitive substring of the MIDI port name
+    rooms: list[str] | None = None  # room names served; None = all rooms
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Device":
+        return cls(name=d["name"], port=d.get("port"), rooms=d.get("rooms"))
+
+    def to_dict(self) -> dict:
+        d: dict = {"name": self.name}
+        if self.port is not None:
+            d["port"] = self.port
+        if self.rooms is not None:
+            d["rooms"] = self.rooms
+        return d
+
+
 @dataclass
 class Config:
     rooms: list[Room]
+    devices: list[Device] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Config":
+        return cls(
+            rooms=[Room.from_dict(r) for r in d.get("rooms", [])],
+            devices=[Device.from_dict(x) for x in d.get("devices", [])],
+        )
 
     def to_dict(self) -> dict:
-        return {"rooms": [r.to_dict() for r in self.rooms]}
+        d: dict = {"rooms": [r.to_dict() for r in self.rooms]}
+        if self.devices:
+            d["devices"] = [x.to_dict() for x in self.devices]
+        return d
 
 
 def default_config() -> Config:
@@ -104,33 +192,45 @@ def default_config() -> Config:
     )
 
 
+def read_config(path: str | Path) -> Config:
+    """Parse config.json; raises instead of falling back to the default.
+
+    Used where a bad file must be rejected rather than replaced (the
+    daemon's live reload keeps running on the config it has).
+    """
+    with open(path) as f:
+        return Config.from_dict(json.load(f))
+
+
 def load_config(path: str | Path) -> Config:
+    """Load config.json, recovering from damage without destroying it.
+
+    A missing file is created with the default room, and so is an empty one
+    with no backup (the repo ships config.json empty). A truncated or
+    corrupt one falls back to its last-known-good backup; with no usable
+    backup the default is used for this run, but the damaged file is left
+    in place for repair rather than overwritten.
+    """
     path = Path(path)
-    if not path.exists() or path.stat().st_size == 0:
-        cfg = default_config()
-        try:
-            save_config(cfg, path)
-        except Exception:
-            pass
-        return cfg
     try:
-        with open(path) as f:
-            data = json.load(f)
-        rooms = [Room.from_dict(r) for r in data.get("rooms", [])]
-        if not rooms:
-            return default_config()
-        return Config(rooms=rooms)
-    except Exception:
+        if path.stat().st_size == 0 and not backup_path(path).exists():
+            raise FileNotFoundError(path)  # not created yet, nothing to lose
+        cfg = read_json(path, Config.from_dict)
+    except FileNotFoundError:
         cfg = default_config()
         try:
             save_config(cfg, path)
         except Exception:
             pass
         return cfg
+    except Exception as e:
+        print(f"❌ {path.name} unreadable ({e}); running on the default room")
+        return default_config()
+    if not cfg.rooms:
+        return default_config()
+    return cfg
 
 
 def save_config(config: Config, path: str | Path) -> None:
-    with open(path, "w") as f:
-        json.dump(config.to_dict(), f, indent=2)
-        f.write("\n")
+    write_json(path, config.to_dict())
 
@@ -0,0 +1,333 @@
+"""Local control socket for the running daemon (JSON lines over a Unix socket).
+
+The daemon listens on `launchpad.sock` next to config.json (owner-only,
+git-ignored). Every request is one JSON object per line:
+
+    {"cmd": "status"}
+    {"cmd": "room", "room": "Kitchen", "page": 1, "surface": "office"}
+
+and gets one JSON line back: `{"ok": true, ...}` or `{"ok": false,
+"error": "..."}`. Handlers run as scheduler steps, so they see the same
+consistent daemon state as preset steps and never race the event loop of
+the asyncio runtime. The commands themselves live on the Controller (see
+`Controller.control_handlers`).
+
+Some commands can also be followed: with `"follow": true` the connection
+stays open after the first reply, and the daemon pushes a further line
+whenever the command's stream (see `Controller.control_streams`) has an
+update, checked every STREAM_INTERVAL on the scheduler. The stream ends
+when either side closes the connection.
+
+Clients (the manage GUI) use `request()` and `Subscription`; `available()`
+tells whether a daemon is listening, so callers can fall back to working
+standalone.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import selectors
+import socket
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator
+
+if TYPE_CHECKING:  # the GUI imports this module only as a client
+    from .scheduler import Scheduler
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SOCKET_PATH = PROJECT_ROOT / "launchpad.sock"
+
+# seconds a client waits for a reply (and a handler may take)
+TIMEOUT = 2.0
+
+# longest request line accepted (a full config push fits comfortably)
+MAX_LINE = 4 * 1024 * 1024
+
+# seconds between checks of followed streams for updates
+STREAM_INTERVAL = 0.1
+
+Handler = Callable[[dict], dict]
+# builds a followed command's update source from its args; each call of
+# the source returns the next update, or None when nothing changed (the
+# first call gives the full reply)
+Stream = Callable[[dict], Callable[[], "dict | None"]]
+
+
+# ---- client ------------------------------------------------------------
+
+
+def request(cmd: str, path: Path = SOCKET_PATH, timeout: float = TIMEOUT,
+            **args) -> dict:
+    """Send one command to the daemon and return its reply fields.
+
+    Raises OSError when no daemon is listening and RuntimeError when the
+    daemon rejected the command.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(json.dumps({"cmd": cmd, **args}).encode() + b"\n")
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    reply = json.loads(buf)
+    if not reply.pop("ok", False):
+        raise RuntimeError(reply.get("error", "request failed"))
+    return reply
+
+
+class Subscription:
+    """A followed command: iterate (on a worker thread) for its replies.
+
+    Connects and sends on construction (OSError when no daemon listens);
+    iteration raises RuntimeError if the daemon rejects the command and
+    ends when the connection closes. `close()` works from any thread.
+    """
+
+    def __init__(self, cmd: str, path: Path = SOCKET_PATH, **args):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.settimeout(TIMEOUT)
+            self._sock.connect(str(path))
+            self._sock.sendall(
+                json.dumps({"cmd": cmd, "follow": True, **args}).encode() + b"\n")
+        except BaseException:
+            self._sock.close()
+            raise
+
+    def __iter__(self) -> Iterator[dict]:
+        with self._sock.makefile("rb") as f:
+            first = True
+            for line in f:
+                reply = json.loads(line)
+                if not reply.pop("ok", False):
+                    raise RuntimeError(reply.get("error", "request failed"))
+                if first:  # updates may be far apart: wait as long as needed
+                    self._sock.settimeout(None)
+                    first = False
+                yield reply
+
+    def close(self) -> None:
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)  # wakes a blocked reader
+        except OSError:
+            pass
+        self._sock.close()
+
+
+def available(path: Path = SOCKET_PATH) -> bool:
+    try:
+        request("ping", path=path, timeout=0.5)
+        return True
+    except Exception:
+        return False
+
+
+# ---- server ------------------------------------------------------------
+
+
+class ControlServer:
+    def __init__(
+        self,
+        handlers: dict[str, Handler],
+        scheduler: Scheduler,
+        path: Path = SOCKET_PATH,
+        streams: dict[str, Stream] | None = None,
+    ):
+        self.handlers = handlers
+        self.streams = streams or {}
+        self.scheduler = scheduler
+        self.path = Path(path)
+        self._sock: socket.socket | None = None
+        self._sel = selectors.DefaultSelector()
+        self._bufs: dict[socket.socket, bytes] = {}
+        # followed connections and their update sources; touched by the
+        # serve thread (add/drop) and the scheduler (pump)
+        self._subs: dict[socket.socket, Callable[[], dict | None]] = {}
+        self._subs_lock = threading.Lock()
+        self._pump_timer = None
+
+    def start(self) -> bool:
+        """Bind the socket and serve on a daemon thread. Best-effort."""
+        if self.path.exists():
+            if available(self.path):
+                print(f"❌ Control socket in use: {self.path}")
+                return False
+            self.path.unlink()  # stale, left by a crashed daemon
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.bind(str(self.path))
+            os.chmod(self.path, 0o600)
+            sock.listen()
+            sock.setblocking(False)
+        except Exception as e:
+            print(f"❌ Control socket error: {e}")
+            return False
+        self._sock = sock
+        self._sel.register(sock, selectors.EVENT_READ)
+        threading.Thread(target=self._serve, name="lp-control", daemon=True).start()
+        return True
+
+    def close(self) -> None:
+        sock, self._sock = self._sock, None
+        if sock is None:
+            return
+        if self._pump_timer is not None:
+            self._pump_timer.cancel()
+        try:
+            sock.close()
+            self.path.unlink()
+        except Exception:
+            pass
+
+    # ---- connection handling ------------------------------------------
+
+    def _serve(self) -> None:
+        while self._sock is not None:
+            try:
+                events = self._sel.select(timeout=1.0)
+            except Exception:
+                return
+            for key, _ in events:
+                if key.fileobj is self._sock:
+                    self._accept()
+                else:
+                    self._read(key.fileobj)
+
+    def _accept(self) -> None:
+        try:
+            conn, _ = self._sock.accept()
+        except Exception:
+            return
+        conn.setblocking(False)
+        self._bufs[conn] = b""
+        self._sel.register(conn, selectors.EVENT_READ)
+
+    def _read(self, conn: socket.socket) -> None:
+        try:
+            chunk = conn.recv(65536)
+        except BlockingIOError:
+            return
+        except Exception:
+            chunk = b""
+        if not chunk:
+            self._drop(conn)
+            return
+        if conn in self._subs:
+            return  # a follower only ever sends its one request
+        buf = self._bufs[conn] + chunk
+        while b"\n" in buf:
+            line, buf = buf.split(b"\n", 1)
+            if line.strip():
+                reply, source = self._dispatch(line)
+                self._reply(conn, reply)
+                if source is not None and conn in self._bufs:
+                    self._follow(conn, source)
+                    return
+        if len(buf) > MAX_LINE:
+            self._reply(conn, {"ok": False, "error": "request too large"})
+            self._drop(conn)
+            return
+        self._bufs[conn] = buf
+
+    def _reply(self, conn: socket.socket, reply: dict) -> None:
+        try:
+            conn.setblocking(True)
+            conn.settimeout(TIMEOUT)
+            conn.sendall(json.dumps(reply).encode() + b"\n")
+            conn.setblocking(False)
+        except Exception:
+            self._drop(conn)
+
+    def _drop(self, conn: socket.socket) -> None:
+        self._bufs.pop(conn, None)
+        with self._subs_lock:
+            self._subs.pop(conn, None)
+        try:
+            self._sel.unregister(conn)
+        except Exception:
+            pass
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    # ---- dispatch ------------------------------------------------------
+
+    def _dispatch(self, line: bytes) -> tuple[dict, Callable[[], dict | None] | None]:
+        """The reply to one request line, plus the update source to keep
+        pumping when the request follows a stream."""
+        try:
+            req = json.loads(line)
+            cmd = req.pop("cmd")
+            if req.pop("follow", False):
+                handler = self._start_stream(self.streams[cmd])
+            else:
+                handler = self.handlers[cmd]
+        except KeyError as e:
+            return {"ok": False, "error": f"unknown command {e}"}, None
+        except Exception as e:
+            return {"ok": False, "error": f"bad request: {e}"}, None
+        fut: Future = Future()
+        self.scheduler.call_soon(self._run, fut, handler, req)
+        try:
+            result = fut.result(TIMEOUT)
+        except Exception as e:
+            return {"ok": False, "error": str(e) or type(e).__name__}, None
+        source = result.pop("_source", None)
+        return {"ok": True, **result}, source
+
+    @staticmethod
+    def _start_stream(stream: Stream) -> Handler:
+        def handler(args: dict) -> dict:
+            source = stream(args)
+            return {**(source() or {}), "_source": source}
+        return handler
+
+    @staticmethod
+    def _run(fut: Future, handler: Handler, args: dict) -> None:
+        try:
+            fut.set_result(handler(args) or {})
+        except Exception as e:
+            fut.set_exception(e)
+
+    # ---- followed streams ----------------------------------------------
+
+    def _follow(self, conn: socket.socket, source: Callable[[], dict | None]) -> None:
+        # the scheduler writes to this connection from now on; blocking
+        # sends with a timeout, reads only to notice the client leaving
+        conn.setblocking(True)
+        conn.settimeout(TIMEOUT)
+        with self._subs_lock:
+            self._subs[conn] = source
+            if self._pump_timer is None:
+                self._pump_timer = self.scheduler.every(STREAM_INTERVAL, self._pump)
+
+    def _pump(self) -> None:
+        with self._subs_lock:
+            subs = list(self._subs.items())
+        for conn, source in subs:
+            try:
+                update = source()
+                if update is None:
+                    continue
+                reply = {"ok": True, **update}
+            except Exception as e:
+                reply = {"ok": False, "error": str(e) or type(e).__name__}
+            try:
+                conn.sendall(json.dumps(reply).encode() + b"\n")
+                if not reply["ok"]:
+                    raise OSError("stream ended")
+            except Exception:
+                with self._subs_lock:
+                    self._subs.pop(conn, None)
+                try:
+                    conn.shutdown(socket.SHUT_RDWR)  # the serve thread drops it
+                except OSError:
+                    pass
@@ -15,8 +15,25 @@ _LAYOUT_SELECT = [0x00, 0x20, 0x29, 0x02, 0x0D, 0x0E]
 PROGRAMMER = 0x01
 LIVE = 0x00
 
+# LED modes are picked by the MIDI channel of the note_on/CC that sets a pad
+# (mido channels are 0-based): channel 1 lights it statically, channel 2
+# flashes between the static color and the new one, channel 3 pulses. The
+# device animates flash/pulse itself, so they cost no ongoing traffic.
+STATIC = 0
+FLASH = 1
+PULSE = 2
+LED_MODES = {"static": STATIC, "flash": FLASH, "pulse": PULSE}
 
-def pick_launchpad_port(names: list[str]) -> str | None:
+# Not a channel: the pad is lit with an exact RGB color through the SysEx
+# LED lighting message (the "color" is then packed 0xRRGGBB, see pack_rgb).
+# SysEx addresses LEDs by their Programmer-layout number.
+RGB = 3
+
+# Novation · Mini MK3 · LED lighting (03); colorspec type 3 = RGB, 0-127 each
+_LED_LIGHTING = [0x00, 0x20, 0x29, 0x02, 0x0D, 0x03]
+
+
+def pick_launchpad_port(names: list[str], match: str | None = None) -> str | None:
     """Return the first Launchpad port from a list of port names.
 
     The whole app works off the device's *real* emitted numbers (no forced
@@ -24,8 +41,50 @@ def pick_launchpad_port(names: list[str]) -> str | None:
     Launchpad — the same port keychecker reads — and the calibration wizard
     records whatever that port sends. In/out use this same rule so LED
     output and button input stay on one port.
+
+    With several Launchpads attached, `match` (a case-insensitive substring,
+    e.g. the ALSA client "24:") narrows it to one unit's ports.
+    """
+    match = match.lower() if match else None
+    return next(
+        (
+            p for p in names
+            if "launchpad" in p.lower() and (match is None or match in p.lower())
+        ),
+        None,
+    )
+
+
+def pack_rgb(rgb: tuple[int, int, int]) -> int:
+    r, g, b = (max(0, min(255, int(c))) for c in rgb)
+    return (r << 16) | (g << 8) | b
+
+
+def _rgb_spec(led: int, packed: int) -> list[int]:
+    r, g, b = (packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF
+    return [0x03, led, r >> 1, g >> 1, b >> 1]
+
+
+def rgb_sysex(led: int, packed: int) -> list[int]:
+    """SysEx payload lighting one LED with a packed 0xRRGGBB color."""
+    return _LED_LIGHTING + _rgb_spec(led, packed)
+
+
+def lighting_sysex(leds: list[tuple[int, int, int]]) -> list[int]:
+    """One SysEx payload lighting many LEDs: `(led, color, mode)` triples.
+
+    Handles STATIC (palette), PULSE and RGB; flash needs both of its colors
+    in SysEx, so callers send FLASH pads as channel messages instead.
     """
-    return next((p for p in names if "launchpad" in p.lower()), None)
+    data = list(_LED_LIGHTING)
+    for led, color, mode in leds:
+        if mode == RGB:
+            data += _rgb_spec(led, color)
+        elif mode == PULSE:
+            data += [0x02, led, color]
+        else:
+            data += [0x00, led, color]
+    return data
 
 
 def layout_sysex(programmer: bool = True) -> list[int]:
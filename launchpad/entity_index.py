@@ -0,0 +1,151 @@
+"""Type-ahead search over Home Assistant entities for the manage GUI.
+
+`EntityIndex` indexes entity ID, friendly name, domain and area. Every word
+of those fields (split on `.`, `_`, `-` and spaces) goes into a prefix map,
+so a query term costs one dict lookup; terms that only match mid-word fall
+back to a substring scan of one precomputed haystack per entity. Results
+are ranked (exact ID, ID prefix, word prefix, substring) and cut to the
+top N, so the picker never has to hold thousands of values.
+
+Typing is incremental: when the new query extends the previous one, only
+the previous matches are re-checked instead of the whole index.
+
+The last fetched list is cached in `entities.json` (git-ignored) so the
+picker is usable at startup, before the daemon or HA has answered.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .storage import read_json, write_json
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_PATH = PROJECT_ROOT / "entities.json"
+
+# results handed to the picker per query
+TOP_N = 50
+
+# longest word prefix kept in the index; longer terms are checked by scan
+MAX_PREFIX = 12
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+@dataclass(frozen=True)
+class Entity:
+    entity_id: str
+    name: str = ""
+    domain: str = ""
+    area: str = ""
+
+    @classmethod
+    def from_state(cls, entity_id: str, state: dict, area: str | None = None) -> Entity:
+        attrs = (state or {}).get("attributes") or {}
+        return cls(
+            entity_id=entity_id,
+            name=str(attrs.get("friendly_name") or ""),
+            domain=entity_id.split(".", 1)[0],
+            area=area or "",
+        )
+
+
+def entities_from_states(states: dict[str, dict],
+                         areas: dict[str, str] | None = None) -> list[Entity]:
+    areas = areas or {}
+    return [Entity.from_state(e, s, areas.get(e)) for e, s in states.items()]
+
+
+# ---- disk cache ----------------------------------------------------------
+
+
+def load_cache(path: Path = CACHE_PATH) -> list[Entity]:
+    try:
+        return read_json(path, lambda d: [Entity(**e) for e in d])
+    except Exception:
+        return []
+
+
+def save_cache(entities: list[Entity], path: Path = CACHE_PATH) -> None:
+    try:
+        write_json(path, [asdict(e) for e in entities])
+    except Exception as e:
+        print(f"❌ Entity cache error: {e}")
+
+
+# ---- index ---------------------------------------------------------------
+
+
+class EntityIndex:
+    def __init__(self, entities: list[Entity] = ()):
+        self._entities = sorted(entities, key=lambda e: e.entity_id)
+        self._ids = [e.entity_id.lower() for e in self._entities]
+        self._haystacks = [
+            " ".join((e.entity_id, e.name, e.domain, e.area)).lower()
+            for e in self._entities
+        ]
+        self._prefixes: dict[str, set[int]] = {}
+        for i, hay in enumerate(self._haystacks):
+            for word in set(_WORD.findall(hay)):
+                for n in range(1, min(len(word), MAX_PREFIX) + 1):
+                    self._prefixes.setdefault(word[:n], set()).add(i)
+        self._last_query = ""
+        self._last_hits: list[int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def search(self, query: str, limit: int = TOP_N) -> list[str]:
+        """Entity IDs matching every term of `query`, best first."""
+        terms = query.lower().split()
+        if not terms:
+            self._last_query, self._last_hits = "", None
+            return [e.entity_id for e in self._entities[:limit]]
+
+        q = " ".join(terms)
+        if self._last_hits is not None and q.startswith(self._last_query):
+            # the query only grew: its matches are a subset of the last ones
+            hits = [i for i in self._last_hits if self._matches(i, terms)]
+            self._last_hits = hits
+        else:
+            hits, complete = self._lookup(terms, limit)
+            self._last_hits = hits if complete else None
+        self._last_query = q
+
+        ranked = heapq.nsmallest(limit, hits, key=lambda i: (self._rank(i, terms), i))
+        return [self._entities[i].entity_id for i in ranked]
+
+    def _lookup(self, terms: list[str], limit: int) -> tuple[list[int], bool]:
+        # Word-prefix hits rank above every mid-word match, so when there
+        # are already `limit` of them the full substring scan is skipped.
+        hits: set[int] | None = None
+        for term in terms:
+            found = self._prefixes.get(term[:MAX_PREFIX], set())
+            hits = set(found) if hits is None else hits & found
+            if not hits:
+                break
+        hits = [i for i in sorted(hits or ()) if self._matches(i, terms)]
+        if len(hits) >= limit:
+            return hits, False
+        return [i for i in range(len(self)) if self._matches(i, terms)], True
+
+    def _matches(self, i: int, terms: list[str]) -> bool:
+        hay = self._haystacks[i]
+        return all(t in hay for t in terms)
+
+    def _rank(self, i: int, terms: list[str]) -> int:
+        # the first term places the ID; every other term must still start
+        # a word for the top tiers, so "kit 5" puts kitchen_5 above kitchen_15
+        eid, first = self._ids[i], terms[0]
+        if not all(i in self._prefixes.get(t[:MAX_PREFIX], ()) for t in terms[1:]):
+            return 3
+        if eid == first:
+            return 0
+        if eid.startswith(first) or eid.split(".", 1)[-1].startswith(first):
+            return 1
+        if i in self._prefixes.get(first[:MAX_PREFIX], ()):
+            return 2
+        return 3
@@ -0,0 +1,132 @@
+"""Pre-rendered base frames for every room page, kept current incrementally.
+
+`FrameCache` holds the grid frame (`{(False, key): look}`) of every
+(room, page) and the selector look of every room. It indexes actions by
+the entities they show, so a state change re-renders only the pads of
+actions watching that entity (and the selector of their room) instead of
+recomputing the room. Changes are only *marked* when they happen (from any
+thread); the work is done on the next read, so a burst of updates costs
+one render per affected pad.
+
+A room switch therefore reads an up-to-date cached frame — a dict copy —
+and hands it to the compositor, which pushes the diff as one frame.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from .compositor import Look
+from .config import Action, Room
+from .device import STATIC
+from .layout import Event
+
+Frame = dict[Event, Look]
+
+
+class FrameCache:
+    def __init__(
+        self,
+        rooms: list[Room],
+        action_look: Callable[[Action], Look],
+        action_lit: Callable[[Action], bool],
+    ):
+        self._action_look = action_look
+        self._action_lit = action_lit
+        self._lock = threading.Lock()
+        self._dirty: set[str] = set()
+        self._all_dirty = True
+        self._presets_dirty = False
+        self.rebuild(rooms)
+
+    # ---- structure -----------------------------------------------------
+
+    def rebuild(self, rooms: list[Room]) -> None:
+        """Re-index after the room/action structure changed."""
+        by_entity: dict[str, list[tuple[int, Action]]] = {}
+        presets: list[tuple[int, Action]] = []
+        pads: dict[tuple[int, int], dict[int, Action]] = {}
+        for room in rooms:
+            rid = id(room)
+            for act in room.actions:
+                pads.setdefault((rid, act.page), {})[act.key] = act
+                if act.entity_ids is None:
+                    presets.append((rid, act))
+                for e in act.entity_ids or ():
+                    by_entity.setdefault(e, []).append((rid, act))
+        with self._lock:
+            self._rooms = {id(room): room for room in rooms}
+            self._by_entity = by_entity
+            self._preset_actions = presets
+            self._pads = pads
+            self._frames: dict[tuple[int, int], Frame] = {}
+            self._selectors: dict[int, Look] = {}
+            self._all_dirty = True
+
+    def action_at(self, room: Room, page: int, key: int) -> Action | None:
+        return self._pads.get((id(room), page), {}).get(key)
+
+    # ---- invalidation (any thread) -------------------------------------
+
+    def touch(self, entity_id: str | None) -> None:
+        """Mark an entity's pads stale; None marks everything."""
+        with self._lock:
+            if entity_id is None:
+                self._all_dirty = True
+            elif entity_id in self._by_entity:
+                self._dirty.add(entity_id)
+
+    def touch_presets(self) -> None:
+        with self._lock:
+            self._presets_dirty = True
+
+    # ---- reads ---------------------------------------------------------
+
+    def frame(self, room: Room, page: int) -> Frame:
+        with self._lock:
+            self._refresh()
+            return dict(self._frames.get((id(room), page), {}))
+
+    def selector(self, room: Room) -> Look:
+        with self._lock:
+            self._refresh()
+            return self._selectors.get(id(room), (room.room_key_color_off, STATIC))
+
+    def _refresh(self) -> None:
+        # caller holds the lock
+        if self._all_dirty:
+            self._all_dirty = self._presets_dirty = False
+            self._dirty.clear()
+            self._frames = {
+                slot: {(False, key): self._action_look(act) for key, act in acts.items()}
+                for slot, acts in self._pads.items()
+            }
+            self._selectors = {rid: self._render_selector(r)
+                               for rid, r in self._rooms.items()}
+            return
+
+        stale: list[tuple[int, Action]] = []
+        for entity_id in self._dirty:
+            stale += self._by_entity.get(entity_id, ())
+        self._dirty.clear()
+        if self._presets_dirty:
+            self._presets_dirty = False
+            stale += self._preset_actions
+
+        rooms = set()
+        for rid, act in stale:
+            self._frames.setdefault((rid, act.page), {})[(False, act.key)] = (
+                self._action_look(act)
+            )
+            rooms.add(rid)
+        for rid in rooms:
+            self._selectors[rid] = self._render_selector(self._rooms[rid])
+
+    def _render_selector(self, room: Room) -> Look:
+        # lit if any entity in the room is on
+        any_on = any(a.entity_ids and self._action_lit(a) for a in room.actions)
+        return (
+            room.room_key_color_any_on if any_on else room.room_key_color_off,
+            STATIC,
+        )
@@ -4,6 +4,12 @@ REST state poll, and a persistent WebSocket state subscription.
 PASSIVE_MODE: when URL/token are absent, every network call is a no-op and
 the local `states` cache is driven only by optimistic writes from the
 controller. The rest of the app treats a passive client transparently.
+
+Threading: by default each service call gets its own short-lived thread and
+the WebSocket runs on a dedicated daemon thread. Setting `executor` routes
+both through a caller-owned pool instead (the asyncio runtime does this so
+the thread count stays fixed), and `start_ws(..., deliver=...)` lets the
+caller decide which thread applies incoming state.
 """
 
 from __future__ import annotations
@@ -11,14 +17,20 @@ from __future__ import annotations
 import json
 import threading
 import time
+from concurrent.futures import Executor
 from typing import Callable
 
 import requests
 import urllib3
 import websocket
 
+from .state_store import StateStore
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# seconds an optimistic write counts as unconfirmed without word from HA
+PENDING_TIMEOUT = 3.0
+
 
 class HAClient:
     def __init__(self, url: str | None, token: str | None):
@@ -29,8 +41,25 @@ class HAClient:
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json",
         }
-        self.states: dict[str, dict] = {}
+        self.states = StateStore()
         self._states_ts = 0.0
+        # when set, service calls and the WS loop run here instead of on
+        # freshly spawned threads
+        self.executor: Executor | None = None
+        # service calls sent but not yet answered, and a hook receiving
+        # (latency_seconds, ok) for each one that finishes
+        self.in_flight = 0
+        self.on_call_done: Callable[[float, bool], None] | None = None
+        # hears the entity_id of every state_changed event applied
+        self.on_state_event: Callable[[str], None] | None = None
+        # plain counters, read by the metrics exporter
+        self.ws_frames = 0  # WebSocket messages received
+        self.ws_connects = 0
+        self.events_applied = 0  # state_changed deltas written to the store
+        self._calls_lock = threading.Lock()
+        # calls handed out and not yet finished (queued ones included)
+        self._unfinished = 0
+        self._idle = threading.Condition(self._calls_lock)
 
     # ---- state helpers -------------------------------------------------
 
@@ -38,25 +67,79 @@ class HAClient:
         return self.states.get(entity_id, {}).get("state")
 
     def set_local(self, entity_id: str, state: str) -> None:
-        """Optimistically update the cache so LEDs react instantly."""
-        self.states[entity_id] = {"state": state}
+        """Optimistically update the cache so LEDs react instantly.
+
+        With a live HA the write stays pending until HA reports the entity
+        (or PENDING_TIMEOUT passes); in passive mode nothing will confirm it.
+        """
+        # keep attributes (e.g. rgb_color) until HA sends the real object
+        new = {**self.states.get(entity_id, {}), "state": state}
+        if self.passive:
+            self.states[entity_id] = new
+        else:
+            self.states.set_pending(entity_id, new, PENDING_TIMEOUT)
 
     # ---- service calls (fire-and-forget) -------------------------------
 
-    def call(self, domain: str, svc: str, data: dict) -> None:
+    def call(
+        self,
+        domain: str,
+        svc: str,
+        data: dict,
+        progress: Callable[[str], None] | None = None,
+    ) -> None:
+        """Fire a service call; `progress` hears "dispatch" and then "ha"
+        (answered or failed) from the thread doing the request."""
         if self.passive:
             return
+        with self._calls_lock:
+            self._unfinished += 1
+        if self.executor is not None:
+            self.executor.submit(self._post, domain, svc, data, progress)
+            return
         threading.Thread(
-            target=requests.post,
-            kwargs=dict(
-                url=f"{self.url}/api/services/{domain}/{svc}",
+            target=self._post, args=(domain, svc, data, progress), daemon=True
+        ).start()
+
+    def wait_idle(self, timeout: float) -> bool:
+        """Block until every call handed out has finished (or `timeout`)."""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._unfinished, timeout)
+
+    def _post(
+        self,
+        domain: str,
+        svc: str,
+        data: dict,
+        progress: Callable[[str], None] | None = None,
+    ) -> None:
+        with self._calls_lock:
+            self.in_flight += 1
+        t0 = time.monotonic()
+        ok = False
+        if progress is not None:
+            progress("dispatch")
+        try:
+            r = requests.post(
+                f"{self.url}/api/services/{domain}/{svc}",
                 headers=self.headers,
                 json=data,
                 timeout=3,
                 verify=False,
-            ),
-            daemon=True,
-        ).start()
+            )
+            ok = r.ok
+        except Exception:
+            pass
+        finally:
+            with self._calls_lock:
+                self.in_flight -= 1
+                self._unfinished -= 1
+                if not self._unfinished:
+                    self._idle.notify_all()
+            if self.on_call_done is not None:
+                self.on_call_done(time.monotonic() - t0, ok)
+            if progress is not None:
+                progress("ha")
 
     # ---- REST poll -----------------------------------------------------
 
@@ -73,7 +156,7 @@ class HAClient:
                 verify=False,
             )
             r.raise_for_status()
-            self.states = {s["entity_id"]: s for s in r.json()}
+            self.states.replace({s["entity_id"]: s for s in r.json()})
             self._states_ts = time.time()
         except Exception:
             pass
@@ -81,22 +164,59 @@ class HAClient:
 
     # ---- WebSocket subscription ----------------------------------------
 
-    def start_ws(self, on_state_change: Callable[[], None]) -> None:
-        """Spawn a daemon thread holding a state_changed subscription.
+    def start_ws(
+        self,
+        on_state_change: Callable[[], None],
+        deliver: Callable[[Callable[[], None]], None] | None = None,
+    ) -> None:
+        """Hold a state_changed subscription on a daemon thread (or on
+        `executor` when set).
 
         `on_state_change` is invoked after each applied update so the caller
-        can repaint LEDs. Reconnects forever on drop.
+        can repaint LEDs. `deliver(fn)` decides where an update is applied;
+        the default runs it inline on the WS thread, the asyncio runtime
+        hops it onto its event loop. Reconnects forever on drop.
         """
         if self.passive:
             return
+        if self.executor is not None:
+            self.executor.submit(self._ws_loop, on_state_change, deliver)
+            return
         threading.Thread(
-            target=self._ws_loop, args=(on_state_change,), daemon=True
+            target=self._ws_loop, args=(on_state_change, deliver), daemon=True
         ).start()
 
-    def _ws_loop(self, on_state_change: Callable[[], None]) -> None:
+    def _apply_event(self, e: dict, on_state_change: Callable[[], None]) -> None:
+        if e["new_state"] is None:  # entity removed from HA
+            self.states.pop(e["entity_id"], None)
+        else:
+            self.states[e["entity_id"]] = e["new_state"]
+        self._states_ts = time.time()
+        self.events_applied += 1
+        if self.on_state_event is not None:
+            self.on_state_event(e["entity_id"])
+        on_state_change()
+
+    def _apply_registries(self, entities: list[dict], devices: list[dict]) -> None:
+        # an entity's own area wins; otherwise it inherits its device's
+        device_area = {d["id"]: d.get("area_id") for d in devices}
+        area_of = {}
+        for ent in entities:
+            area = ent.get("area_id") or device_area.get(ent.get("device_id"))
+            if area:
+                area_of[ent["entity_id"]] = area
+        self.states.set_areas(area_of)
+
+    def _ws_loop(
+        self,
+        on_state_change: Callable[[], None],
+        deliver: Callable[[Callable[[], None]], None] | None = None,
+    ) -> None:
+        deliver = deliver or (lambda fn: fn())
         ws_url = self.url.replace("http", "ws") + "/api/websocket"
 
         def on_open(ws):
+            self.ws_connects += 1
             ws.send(json.dumps({"type": "auth", "access_token": self.token}))
             ws.send(
                 json.dumps(
@@ -107,15 +227,25 @@ class HAClient:
                     }
                 )
             )
+            # registries feed the store's area index
+            ws.send(json.dumps({"id": 2, "type": "config/entity_registry/list"}))
+            ws.send(json.dumps({"id": 3, "type": "config/device_registry/list"}))
+
+        registries: dict[int, list] = {}
 
         def on_message(ws, msg):
+            self.ws_frames += 1
             try:
                 d = json.loads(msg)
+                if d.get("type") == "result" and d.get("id") in (2, 3):
+                    registries[d["id"]] = d.get("result") or []
+                    if len(registries) == 2:
+                        ents, devs = registries.pop(2), registries.pop(3)
+                        deliver(lambda: self._apply_registries(ents, devs))
+                    return
                 e = d.get("event", {}).get("data", {})
                 if "entity_id" in e and "new_state" in e:
-                    self.states[e["entity_id"]] = e["new_state"]
-                    self._states_ts = time.time()
-                    on_state_change()
+                    deliver(lambda: self._apply_event(e, on_state_change))
             except Exception:
                 pass
 
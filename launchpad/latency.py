@@ -0,0 +1,160 @@
+"""Press latency tracing: where the time goes between a pad and its light.
+
+Every entity-pad press opens a trace when `_handle_message` receives it.
+The trace is then stamped as the press moves through the daemon; each
+span is the time from receipt to:
+
+    led       the optimistic LED frame handed to the device
+    dispatch  the first HA service call handed to the HTTP client
+    ha        the last of those calls answered by HA
+    confirm   the last pressed entity's state_changed from HA
+
+Samples go into a rolling window per span (the last WINDOW presses), from
+which `report()` gives count and p50/p95/p99 in milliseconds. The daemon
+prints it on SIGUSR1 and exports it through the control socket's
+`metrics` command. Traces that never complete (a pad whose look did not
+change, HA never confirming) are dropped after TRACE_TIMEOUT.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+
+SPANS = ("led", "dispatch", "ha", "confirm")
+
+WINDOW = 1024  # samples kept per span
+TRACE_TIMEOUT = 10.0  # seconds an unfinished trace is kept
+
+PERCENTILES = (50, 95, 99)
+
+
+class Trace:
+    __slots__ = ("t0", "calls_left", "unconfirmed", "done")
+
+    def __init__(self, t0: float, entity_ids: list[str]):
+        self.t0 = t0
+        self.calls_left = len(entity_ids)
+        self.unconfirmed = set(entity_ids)
+        self.done: set[str] = set()
+
+
+def _percentile(ordered: list[float], p: int) -> float:
+    # nearest rank
+    k = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered) + 0.5) - 1))
+    return ordered[k]
+
+
+class LatencyTracer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = {
+            span: deque(maxlen=WINDOW) for span in SPANS
+        }
+        self._led: dict[tuple[str, object], Trace] = {}  # (surface, key) -> trace
+        self._confirm: dict[str, Trace] = {}  # entity_id -> trace
+        # span -> [samples, seconds] since start, for the metrics summary
+        self._totals: dict[str, list] = {span: [0, 0.0] for span in SPANS}
+        self.presses = 0
+
+    # ---- recording (any thread) ----------------------------------------
+
+    def begin(self, entity_ids: list[str], t0: float,
+              surface: str | None = None, key: object = None) -> Trace:
+        trace = Trace(t0, entity_ids)
+        with self._lock:
+            self.presses += 1
+            self._prune(t0)
+            if surface is not None:
+                self._led[(surface, key)] = trace
+            for e in entity_ids:
+                self._confirm[e] = trace  # a newer press supersedes
+        return trace
+
+    def mark(self, trace: Trace, span: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._record(trace, span, now)
+
+    def call_progress(self, trace: Trace, stage: str) -> None:
+        """HAClient.call hook: "dispatch" once, "ha" after the last reply."""
+        now = time.monotonic()
+        with self._lock:
+            if stage == "ha":
+                trace.calls_left -= 1
+                if trace.calls_left > 0:
+                    return
+            self._record(trace, stage, now)
+
+    def led_sent(self, surface: str, keys: list) -> None:
+        """FrameCompositor hook: a frame with `keys` reached the device."""
+        if not self._led:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                trace = self._led.pop((surface, key), None)
+                if trace is not None:
+                    self._record(trace, "led", now)
+
+    def confirmed(self, entity_id: str) -> None:
+        """HAClient hook: HA reported a state_changed for the entity."""
+        if entity_id not in self._confirm:
+            return
+        now = time.monotonic()
+        with self._lock:
+            trace = self._confirm.pop(entity_id, None)
+            if trace is None:
+                return
+            trace.unconfirmed.discard(entity_id)
+            if not trace.unconfirmed:
+                self._record(trace, "confirm", now)
+
+    def _record(self, trace: Trace, span: str, now: float) -> None:
+        # caller holds the lock
+        if span in trace.done:
+            return
+        trace.done.add(span)
+        self._samples[span].append(now - trace.t0)
+        total = self._totals[span]
+        total[0] += 1
+        total[1] += now - trace.t0
+
+    def _prune(self, now: float) -> None:
+        # caller holds the lock
+        cutoff = now - TRACE_TIMEOUT
+        for table in (self._led, self._confirm):
+            for k in [k for k, t in table.items() if t.t0 < cutoff]:
+                del table[k]
+
+    # ---- reporting -----------------------------------------------------
+
+    def report(self) -> dict[str, dict[str, float]]:
+        """{span: {"count", "p50", "p95", "p99"}} in milliseconds."""
+        with self._lock:
+            windows = {span: sorted(s) for span, s in self._samples.items()}
+        out = {}
+        for span, ordered in windows.items():
+            row: dict[str, float] = {"count": len(ordered)}
+            for p in PERCENTILES:
+                row[f"p{p}"] = (
+                    round(_percentile(ordered, p) * 1000, 2) if ordered else 0.0
+                )
+            out[span] = row
+        return out
+
+    def totals(self) -> dict[str, tuple[int, float]]:
+        """{span: (samples, seconds)} since the daemon started."""
+        with self._lock:
+            return {span: (n, s) for span, (n, s) in self._totals.items()}
+
+    def print_report(self) -> None:
+        print(f"⏱ Press latency ({self.presses} presses traced, "
+              f"last {WINDOW} per span)")
+        for span, row in self.report().items():
+            if not row["count"]:
+                print(f"   {span:<9} no samples")
+                continue
+            print(f"   {span:<9} p50 {row['p50']:7.1f} ms   p95 {row['p95']:7.1f} ms"
+                  f"   p99 {row['p99']:7.1f} ms   n={row['count']}")
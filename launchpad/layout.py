@@ -27,6 +27,8 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+from .storage import read_json, write_json
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 LAYOUT_PATH = PROJECT_ROOT / "layout.json"
 
@@ -111,11 +113,20 @@ class Layout:
 
 
 def load_layout(path: Path = LAYOUT_PATH) -> Layout:
+    # a damaged layout.json falls back to its backup, then to the formula
     try:
-        with open(path) as f:
-            raw = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        return read_json(path, _parse_layout)
+    except (OSError, ValueError, AttributeError):
         return Layout()
+
+
+def read_layout(path: Path = LAYOUT_PATH) -> Layout:
+    """Like load_layout, but a missing or unreadable file raises."""
+    with open(path) as f:
+        return _parse_layout(json.load(f))
+
+
+def _parse_layout(raw: dict) -> Layout:
     cells: dict[tuple[int, int], Event] = {}
     for key, val in (raw.get("cells") or {}).items():
         try:
@@ -134,6 +145,4 @@ def save_layout(layout: Layout, path: Path = LAYOUT_PATH) -> None:
         f"{r},{c}": {"n": num, "cc": is_cc}
         for (r, c), (is_cc, num) in layout.as_dict().items()
     }
-    with open(path, "w") as f:
-        json.dump({"cells": cells}, f, indent=2)
-        f.write("\n")
+    write_json(path, {"cells": cells})
@@ -7,46 +7,64 @@ Run:
 Features:
 - Visual 9x9 grid preview of the selected room, drawn to mirror the physical
   device: round function/scene buttons, square pads, lit pads glowing their
-  real velocity color.
+  real velocity color. "Live" follows the running daemon's own rendering
+  of the page (pushed as it changes), so pads show what the hardware shows
+  instead of their on color.
 - Learn mode: click Learn, press a physical Launchpad button, the note/CC
   number is captured. Requires the daemon stopped so this app can hold the
   MIDI port:  sudo systemctl stop launchpad_controller
 - Map layout: calibration wizard (Map layout button) that steps through every
   grid position and records which physical button sits there, so the grid
   matches your unit's actual note/CC numbering. Saved to layout.json.
-- Home Assistant entity picker: entities are fetched via .env credentials
-  (falls back to free-text entry in passive mode).
-- Color fields can be previewed live on the device.
+- Home Assistant entity picker: type-ahead search by entity ID, name,
+  domain or area. Entities come from the running daemon (over its control
+  socket) or are fetched via the saved credentials, and the last list is
+  cached on disk so search works before either answers (falls back to
+  free-text entry in passive mode).
+- Color fields can be previewed live on the device — through the daemon
+  when it holds the MIDI port. "Preview" mirrors the whole edited page on
+  the Launchpad as one batched frame (on the daemon's preview layer while
+  it runs) until switched off, resending only pads that change.
 
 This app never runs while the daemon owns the MIDI port; it edits config.json
-on disk. Saving restarts the systemd daemon automatically so the changes take
-effect (via systemctl, with a pkexec fallback for the privilege prompt).
+on disk. Saving hands the new config to a running daemon over its control
+socket, which applies it live; only when no daemon answers is the systemd
+service restarted (via systemctl, with a pkexec fallback for the privilege
+prompt).
 """
 
 from __future__ import annotations
 
+import importlib.util
 import json
+import os
 import queue
 import shutil
 import subprocess
 import threading
+import time
 from pathlib import Path
 
-from . import device
+from . import control, device
 from .config import Action, Config, Room, load_config, save_config
-from .ha_client import HAClient
+from .entity_index import EntityIndex, entities_from_states, load_cache, save_cache
 from .layout import Layout, load_layout, save_layout
-from .palette import hex_color, mix, rgb, to_hex
-from .settings import get_credentials, load_settings, save_settings
+from .palette import hex_color, mix, nearest, rgb, to_hex
+from .preset_registry import PresetRegistry
+from .settings import get_credentials, load_settings, save_settings, sysex_frames
 
-try:
-    import mido
-except Exception:  # pragma: no cover - optional at edit time
-    mido = None
+# mido (and rtmidi behind it) is imported by MidiBridge.connect on its probe
+# thread; HAClient (requests, websocket) where it's used. Neither is needed
+# to draw the window.
+HAVE_MIDO = importlib.util.find_spec("mido") is not None
+mido = None
+
+# LAUNCHPAD_STARTUP_TRACE=1 prints how long each startup phase took
+STARTUP_TRACE = bool(os.environ.get("LAUNCHPAD_STARTUP_TRACE"))
 
 try:
     import tkinter as tk
-    from tkinter import filedialog, messagebox, simpledialog, ttk
+    from tkinter import colorchooser, filedialog, messagebox, simpledialog, ttk
 except ImportError:
     raise SystemExit(
         "Tkinter is required for the manage GUI but is not installed.\n"
@@ -59,7 +77,6 @@ except ImportError:
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 CONFIG_PATH = PROJECT_ROOT / "config.json"
-PRESETS_DIR = PROJECT_ROOT / "presets"
 ICON_PATH = PROJECT_ROOT / "assets" / "launchpad.png"
 
 SERVICE_NAME = "launchpad_controller"
@@ -114,6 +131,17 @@ def _lum(c: tuple[int, int, int]) -> float:
 # ======================================================================
 
 class PadGrid(tk.Canvas):
+    """Retained-mode grid: every cell's canvas items are created once and
+    restyled in place with `itemconfigure`; `render` only touches cells
+    whose (info, selected) state changed since the last call.
+
+    A cell's info is (kind, color, label, mode): color a palette velocity
+    or an (r, g, b) tuple, mode None/"static", or "flash"/"pulse" (drawn
+    with a dashed rim).
+    """
+
+    MODE_DASH = {"flash": (4, 3), "pulse": (1, 3)}
+
     CELL = 42
     GAP = 6
     MARGIN = 14
@@ -125,7 +153,15 @@ class PadGrid(tk.Canvas):
             master, width=span, height=span, bg=PANEL, highlightthickness=0, bd=0
         )
         self.on_click = on_click
-        self._rects: dict[tuple[int, int], tuple[int, int, int, int]] = {}
+        # per cell: canvas item ids by role, and the state they show
+        self._items: dict[tuple[int, int], dict[str, int]] = {}
+        self._shown: dict[tuple[int, int], tuple] = {}
+        # rounded deck backdrop so the grid reads as the device body
+        self._round_rect(4, 4, span - 4, span - 4, 20,
+                         fill="#0A0B0F", outline="#20252F", width=1)
+        for r in range(GRID):
+            for c in range(GRID):
+                self._items[(r, c)] = self._create_cell(r, c)
         self.bind("<Button-1>", self._click)
 
     def _round_rect(self, x0, y0, x1, y1, rad, **kw):
@@ -142,67 +178,144 @@ class PadGrid(tk.Canvas):
         return x0, y0, x0 + self.CELL, y0 + self.CELL
 
     def _click(self, ev) -> None:
-        for (r, c), (x0, y0, x1, y1) in self._rects.items():
-            if x0 <= ev.x <= x1 and y0 <= ev.y <= y1:
-                self.on_click(r, c)
-                return
+        pitch = self.CELL + self.GAP
+        c, dx = divmod(ev.x - self.MARGIN, pitch)
+        r, dy = divmod(ev.y - self.MARGIN, pitch)
+        if 0 <= r < GRID and 0 <= c < GRID and dx <= self.CELL and dy <= self.CELL:
+            self.on_click(r, c)
 
     def render(self, pads: dict, selected: tuple[int, int] | None) -> None:
-        self.delete("all")
-        self._rects = {}
-        # rounded deck backdrop so the grid reads as the device body
-        self._round_rect(4, 4, self.span - 4, self.span - 4, 20,
-                         fill="#0A0B0F", outline="#20252F", width=1)
-        for r in range(GRID):
-            for c in range(GRID):
-                self._rects[(r, c)] = self._box(r, c)
-                self._draw(r, c, pads.get((r, c)), selected == (r, c))
+        for cell in self._items:
+            state = (pads.get(cell), selected == cell)
+            if self._shown.get(cell) != state:
+                self._shown[cell] = state
+                self._draw(*cell, *state)
 
     def _shape(self, x0, y0, x1, y1, round_btn, **kw):
         # round function/scene buttons vs square grid pads — mirrors hardware
         if round_btn:
             return self.create_oval(x0, y0, x1, y1, **kw)
-        rad = 12
-        pts = [
-            x0 + rad, y0, x1 - rad, y0, x1, y0, x1, y0 + rad,
-            x1, y1 - rad, x1, y1, x1 - rad, y1, x0 + rad, y1,
-            x0, y1, x0, y1 - rad, x0, y0 + rad, x0, y0,
-        ]
-        return self.create_polygon(pts, smooth=True, **kw)
+        return self._round_rect(x0, y0, x1, y1, 12, **kw)
 
-    def _draw(self, r, c, info, sel) -> None:
+    def _create_cell(self, r: int, c: int) -> dict[str, int]:
         x0, y0, x1, y1 = self._box(r, c)
-        round_btn = r == 0 or c == 8
+        rb = r == 0 or c == 8
+        hidden = {"fill": "", "state": "hidden", "width": 1}
+        return {
+            # restrained halo: two faint rings bleeding a lit pad's color
+            # into the deck, kept thin/dim so it reads as a lens, not neon
+            "halo5": self._shape(x0 - 5, y0 - 5, x1 + 5, y1 + 5, rb, **hidden),
+            "halo2": self._shape(x0 - 2, y0 - 2, x1 + 2, y1 + 2, rb, **hidden),
+            "core": self._shape(x0, y0, x1, y1, rb, fill=PAD_OFF,
+                                outline=BEZEL, width=1),
+            # unlit pad: raised chiclet — lighter face over a dark seat so
+            # the 8x8 reads as buttons rather than holes in the deck
+            "seat": self._shape(x0 + 1, y0 + 1, x1 - 1, y0 + int((y1 - y0) * 0.5),
+                                rb, fill="", outline="#1B2028", width=1),
+            "text": self.create_text((x0 + x1) // 2, (y0 + y1) // 2, text="",
+                                     font=FONT_PAD, state="hidden"),
+            "sel": self._shape(x0 - 3, y0 - 3, x1 + 3, y1 + 3, rb, fill="",
+                               outline=SELECT, width=2, state="hidden"),
+        }
+
+    def _draw(self, r, c, info, sel) -> None:
+        it = self._items[(r, c)]
         lit = info is not None and info[1] is not None
+        cfg = self.itemconfigure
+        dash = self.MODE_DASH.get(info[3]) if info is not None and len(info) > 3 else None
 
         if lit:
-            color = rgb(info[1])
-            # restrained halo: two faint rings bleeding the pad color into the
-            # deck. Kept thin/dim so the pad reads as a lit lens, not neon.
-            for off, t in ((5, 0.80), (2, 0.58)):
-                self._shape(x0 - off, y0 - off, x1 + off, y1 + off, round_btn,
-                            fill="", outline=to_hex(mix(color, CHASSIS_RGB, t)),
-                            width=1)
+            color = info[1] if isinstance(info[1], tuple) else rgb(info[1])
+            cfg(it["halo5"], outline=to_hex(mix(color, CHASSIS_RGB, 0.80)),
+                state="normal")
+            cfg(it["halo2"], outline=to_hex(mix(color, CHASSIS_RGB, 0.58)),
+                state="normal")
             # core: solid fill with a border only a touch lighter than itself
-            self._shape(x0, y0, x1, y1, round_btn, fill=to_hex(color),
-                        outline=to_hex(mix(color, WHITE, 0.22)), width=1)
+            cfg(it["core"], fill=to_hex(color), dash=dash or "",
+                outline=to_hex(mix(color, WHITE, 0.22)) if dash is None else WHITE)
+            cfg(it["seat"], state="hidden")
         else:
-            # unlit pad: raised chiclet — lighter face over a dark seat so the
-            # 8x8 reads as buttons rather than holes in the deck
-            self._shape(x0, y0, x1, y1, round_btn, fill=PAD_OFF,
-                        outline=BEZEL, width=1)
-            self._shape(x0 + 1, y0 + 1, x1 - 1, y0 + int((y1 - y0) * 0.5),
-                        round_btn, fill="", outline="#1B2028", width=1)
+            cfg(it["halo5"], state="hidden")
+            cfg(it["halo2"], state="hidden")
+            cfg(it["core"], fill=PAD_OFF, outline=BEZEL, dash="")
+            cfg(it["seat"], state="normal")
 
         if info is not None:
-            tcol = ("#08120A" if lit and _lum(rgb(info[1])) > 140 else
+            tcol = ("#08120A" if lit and _lum(color) > 140 else
                     (INK if lit else INK_DIM))
-            self.create_text((x0 + x1) // 2, (y0 + y1) // 2,
-                             text=info[2], fill=tcol, font=FONT_PAD)
+            cfg(it["text"], text=info[2], fill=tcol, state="normal")
+        else:
+            cfg(it["text"], state="hidden")
 
-        if sel:
-            self._shape(x0 - 3, y0 - 3, x1 + 3, y1 + 3, round_btn,
-                        fill="", outline=SELECT, width=2)
+        cfg(it["sel"], state="normal" if sel else "hidden")
+
+
+# ======================================================================
+# Swatches: the 128 palette colors pre-rendered once, shared by the color
+# picker sheet and the editor's color chips
+# ======================================================================
+
+class Swatches:
+    """Lazily rendered PhotoImages of palette colors.
+
+    `sheet` is the whole picker grid as one image (built on first open);
+    `chip(v)` is one editor chip per velocity. Highlights are canvas items
+    drawn over them, so nothing is re-rendered on hover or selection.
+    """
+
+    COLS, CELL, GAP = 16, 26, 3
+    CHIP_W, CHIP_H = 50, 24
+
+    def __init__(self, master: tk.Misc):
+        self.master = master
+        self._sheet: tk.PhotoImage | None = None
+        self._chips: dict[int, tk.PhotoImage] = {}
+
+    @classmethod
+    def size(cls) -> tuple[int, int]:
+        pitch = cls.CELL + cls.GAP
+        return cls.COLS * pitch + cls.GAP, 8 * pitch + cls.GAP
+
+    @classmethod
+    def origin(cls, i: int) -> tuple[int, int]:
+        r, c = divmod(i, cls.COLS)
+        pitch = cls.CELL + cls.GAP
+        return cls.GAP + c * pitch, cls.GAP + r * pitch
+
+    @classmethod
+    def index_at(cls, x: float, y: float) -> int | None:
+        pitch = cls.CELL + cls.GAP
+        c, r = int((x - cls.GAP) // pitch), int((y - cls.GAP) // pitch)
+        i = r * cls.COLS + c
+        return i if 0 <= c < cls.COLS and 0 <= i < 128 else None
+
+    @property
+    def sheet(self) -> tk.PhotoImage:
+        if self._sheet is None:
+            w, h = self.size()
+            img = tk.PhotoImage(master=self.master, width=w, height=h)
+            img.put(PANEL, to=(0, 0, w, h))
+            for i in range(128):
+                x0, y0 = self.origin(i)
+                col = rgb(i)
+                # 1px rim in the color dimmed into the chassis, then the body
+                img.put(to_hex(mix(col, CHASSIS_RGB, 0.5)),
+                        to=(x0, y0, x0 + self.CELL, y0 + self.CELL))
+                img.put(to_hex(col), to=(x0 + 1, y0 + 1,
+                                         x0 + self.CELL - 1, y0 + self.CELL - 1))
+            self._sheet = img
+        return self._sheet
+
+    def chip(self, velocity: int) -> tk.PhotoImage:
+        img = self._chips.get(velocity)
+        if img is None:
+            col = rgb(velocity)
+            w, h = self.CHIP_W, self.CHIP_H
+            img = tk.PhotoImage(master=self.master, width=w, height=h)
+            img.put(to_hex(mix(col, WHITE, 0.3)), to=(0, 0, w, h))
+            img.put(to_hex(col), to=(1, 1, w - 1, h - 1))
+            self._chips[velocity] = img
+        return img
 
 
 # ======================================================================
@@ -214,16 +327,25 @@ class MidiBridge:
         self.inport = None
         self.outport = None
         self.in_name = None
-        self.status = "mido not installed" if mido is None else "not connected"
+        self.status = "not connected" if HAVE_MIDO else "mido not installed"
         self.events: "queue.Queue[tuple[str, int]]" = queue.Queue()
         self._stop = threading.Event()
+        self.sysex_frames = sysex_frames()
+        self._shown: dict[tuple[bool, int], int] = {}  # lit pads on the device
+        # Self-pipe: the reader thread writes a byte per event so the Tk loop
+        # can wake on the read end (createfilehandler) instead of polling.
+        self.wakeup_fd, self._wake_w = os.pipe()
+        os.set_blocking(self.wakeup_fd, False)
+        os.set_blocking(self._wake_w, False)
         # No connect here — the GUI probes in a background thread after the
         # window is up, so a missing/busy device never blocks startup.
 
     def connect(self) -> None:
-        if mido is None:
+        global mido
+        if not HAVE_MIDO:
             return
         try:
+            import mido
             ins = mido.get_input_names()
             outs = mido.get_output_names()
             in_name = device.pick_launchpad_port(ins)
@@ -247,22 +369,74 @@ class MidiBridge:
             if self._stop.is_set():
                 return
             if msg.type == "note_on" and msg.velocity > 0:
-                self.events.put(("note", msg.note))
+                self._emit(("note", msg.note))
             elif msg.type == "control_change" and msg.value > 0:
-                self.events.put(("cc", msg.control))
+                self._emit(("cc", msg.control))
+
+    def _emit(self, event: tuple[str, int]) -> None:
+        self.events.put(event)
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            pass  # pipe full: a wakeup is already pending
+
+    def drain(self) -> list[tuple[str, int]]:
+        """Everything captured since the last call (clears the wakeup)."""
+        try:
+            while os.read(self.wakeup_fd, 4096):
+                pass
+        except OSError:
+            pass
+        out = []
+        try:
+            while True:
+                out.append(self.events.get_nowait())
+        except queue.Empty:
+            return out
+
+    @staticmethod
+    def _pad_message(number: int, color: int, is_cc: bool):
+        if is_cc:
+            return mido.Message("control_change", control=number, value=color)
+        return mido.Message("note_on", note=number, velocity=color)
 
     def light(self, number: int, color: int, is_cc: bool) -> None:
         if not self.outport:
             return
         try:
-            self.outport.send(
-                mido.Message("control_change", control=number, value=color)
-                if is_cc
-                else mido.Message("note_on", note=number, velocity=color)
-            )
+            self.outport.send(self._pad_message(number, color, is_cc))
+            self._shown[(is_cc, number)] = color
         except Exception:
             pass
 
+    def show(self, frame: dict[tuple[bool, int], int]) -> None:
+        """Make the device show `frame` ((is_cc, number) -> color).
+
+        Only pads that differ from what is lit now are sent (pads missing
+        from `frame` go dark) — as one SysEx with launchpad_sysex_frames,
+        like the daemon's compositor, else one message per pad.
+        """
+        if not self.outport:
+            return
+        changed = {k: c for k, c in frame.items() if self._shown.get(k, 0) != c}
+        changed.update((k, 0) for k in self._shown if k not in frame)
+        if not changed:
+            return
+        try:
+            if self.sysex_frames and len(changed) > 1:
+                leds = [(n, c, device.STATIC) for (_, n), c in changed.items()]
+                self.outport.send(mido.Message("sysex", data=device.lighting_sysex(leds)))
+            else:
+                for (is_cc, n), c in changed.items():
+                    self.outport.send(self._pad_message(n, c, is_cc))
+        except Exception:
+            return
+        for k, c in changed.items():
+            if c:
+                self._shown[k] = c
+            else:
+                self._shown.pop(k, None)
+
     def close(self) -> None:
         self._stop.set()
         for p in (self.inport, self.outport):
@@ -271,6 +445,11 @@ class MidiBridge:
                     p.close()
             except Exception:
                 pass
+        for fd in (self.wakeup_fd, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
 
 
 # ======================================================================
@@ -279,29 +458,67 @@ class MidiBridge:
 
 class ManageApp(tk.Tk):
     def __init__(self):
+        self._startup: list[tuple[str, float]] = []
+        self._trace("start")
         super().__init__()
         self.title("Launchpad Macro Manager")
         self.geometry("1200x780")
         self.configure(bg=CHASSIS)
         self.minsize(1040, 680)
         self._set_app_icon()
+        self._trace("tk")
 
         self.config_model: Config = load_config(CONFIG_PATH)
         self.layout: Layout = load_layout()
         self.midi = MidiBridge()
-        self.entities: list[str] = []
+        self.entity_index = EntityIndex()  # filled off-thread, cache first
+        # live mirror: the daemon's own rendering of the shown page, pushed
+        # over a followed control command, (is_cc, number) -> (color, mode)
+        self.live_pads: dict[tuple[bool, int], tuple[int, str]] = {}
+        self._live_on = False
+        self._live_sub: control.Subscription | None = None
+        self._live_target: tuple[str, int] | None = None  # (room, page) followed
+        self._live_gen = 0  # bumped per (re)subscribe; older streams are dropped
+        self._preview_on = False
+        self._preview_sent: dict[tuple[bool, int], int] | None = None
+        # daemon preview requests, sent in order by one lazily started thread
+        self._preview_jobs: "queue.Queue[dict]" = queue.Queue()
+        self._preview_thread: threading.Thread | None = None
         self.learn_target = None  # tk.Entry awaiting a captured number
         self.map_capture = None  # callback(kind, number) for the layout wizard
         self.current_room: Room | None = None
+        self.current_page = 0
         self.current_action: Action | None = None
 
+        self._trace("config")
+
+        self.swatches = Swatches(self)  # palette images, rendered on first use
+
         self._setup_style()
         self._build_ui()
-        self._load_entities_async()
+        self._trace("ui")
         self._refresh_rooms()
-        self._poll_midi()
-        self._connect_async()  # probe MIDI without blocking the window
+        self._watch_midi()
         self.protocol("WM_DELETE_WINDOW", self._on_close)
+        # entity fetch and MIDI probe wait until the window has been drawn
+        self.after_idle(self._start_background)
+
+    def _start_background(self) -> None:
+        self._trace("interactive")
+        self._load_entities_async()
+        self._connect_async()  # probe MIDI without blocking the window
+        if STARTUP_TRACE:
+            (_, t0), parts = self._startup[0], []
+            t = t0
+            for phase, at in self._startup[1:]:
+                parts.append(f"{phase} {(at - t) * 1000:.0f} ms")
+                t = at
+            total = (t - t0) * 1000
+            print(f"⏱ Startup {total:.0f} ms: " + ", ".join(parts))
+
+    def _trace(self, phase: str) -> None:
+        if STARTUP_TRACE:
+            self._startup.append((phase, time.perf_counter()))
 
     def _set_app_icon(self) -> None:
         # Tk 8.6 reads PNG natively; keep a ref so it isn't garbage-collected.
@@ -421,7 +638,8 @@ class ManageApp(tk.Tk):
         self.rooms_container = tk.Frame(inner, bg=PANEL)
         self.rooms_container.pack(fill="both", expand=True)
         self._room_active_idx: int | None = None
-        self._room_rows: list[tk.Frame] = []
+        self._room_rows: list[tuple] = []  # (row, accent, name, cc, badge)
+        self._room_shown: list[tuple | None] = []
 
         rb = tk.Frame(inner, bg=PANEL)
         rb.pack(fill="x", pady=(10, 0))
@@ -456,6 +674,20 @@ class ManageApp(tk.Tk):
                  font=FONT_H).pack(side="left", padx=10)
         ttk.Button(head, text="Map layout", style="Ghost.TButton",
                    command=self._map_layout).pack(side="right")
+        self._live_btn = ttk.Button(head, text="Live", style="Ghost.TButton",
+                                    command=self._toggle_live)
+        self._live_btn.pack(side="right", padx=(0, 6))
+        self._preview_btn = ttk.Button(head, text="Preview", style="Ghost.TButton",
+                                       command=self._toggle_preview)
+        self._preview_btn.pack(side="right", padx=(0, 6))
+        # pages: ▶ past the last page opens an empty one to add macros to
+        ttk.Button(head, text="▶", width=2, style="Ghost.TButton",
+                   command=lambda: self._step_page(1)).pack(side="right", padx=(0, 10))
+        self.page_var = tk.StringVar()
+        tk.Label(head, textvariable=self.page_var, fg=INK_DIM, bg=PANEL,
+                 font=FONT_EYE).pack(side="right", padx=4)
+        ttk.Button(head, text="◀", width=2, style="Ghost.TButton",
+                   command=lambda: self._step_page(-1)).pack(side="right")
 
         wrap = tk.Frame(inner, bg=PANEL)
         wrap.pack(expand=True)
@@ -516,8 +748,11 @@ class ManageApp(tk.Tk):
         self.entities_list.pack(fill="x", pady=(2, 4))
         erow = tk.Frame(self.entity_frame, bg=PANEL)
         erow.pack(fill="x")
-        self.entity_pick = ttk.Combobox(erow, width=24, font=FONT_MONO)
+        self.entity_pick = ttk.Combobox(erow, width=24, font=FONT_MONO,
+                                        postcommand=self._entity_matches)
         self.entity_pick.pack(side="left", fill="x", expand=True)
+        self._entity_search_job = None
+        self.entity_pick.bind("<KeyRelease>", self._on_entity_typed)
         ttk.Button(erow, text="+", width=3, command=self._add_entity).pack(
             side="left", padx=(6, 2))
         ttk.Button(erow, text="−", width=3, style="Ghost.TButton",
@@ -529,7 +764,7 @@ class ManageApp(tk.Tk):
         self.preset_var = tk.StringVar()
         self.preset_pick = ttk.Combobox(
             self.preset_frame, textvariable=self.preset_var,
-            values=self._scan_presets(), width=18, state="readonly")
+            postcommand=self._scan_presets, width=18, state="readonly")
         self.preset_pick.pack(fill="x", pady=2)
 
         # colors
@@ -565,15 +800,14 @@ class ManageApp(tk.Tk):
                          cursor="hand2")
         chip.pack(side="left", padx=(0, 8))
         chip.bind("<Button-1>", lambda _e: self._pick_color(var))
+        face = chip.create_image(1, 1, anchor="nw")
+        num = chip.create_text(25, 12, font=FONT_PAD)
 
         def paint(*_):
-            chip.delete("all")
-            col = rgb(var.get())
-            chip.create_rectangle(1, 1, 50, 24, fill=to_hex(col),
-                                  outline=to_hex(mix(col, WHITE, 0.3)))
-            chip.create_text(25, 12, text=str(var.get()),
-                             fill="#0B0D10" if _lum(col) > 140 else INK,
-                             font=FONT_PAD)
+            v = var.get()
+            chip.itemconfigure(face, image=self.swatches.chip(v))
+            chip.itemconfigure(num, text=str(v),
+                               fill="#0B0D10" if _lum(rgb(v)) > 140 else INK)
 
         ttk.Button(f, text="Pick", width=5, style="Ghost.TButton",
                    command=lambda: self._pick_color(var)).pack(side="left", padx=(6, 0))
@@ -584,65 +818,116 @@ class ManageApp(tk.Tk):
 
     # ---- data helpers --------------------------------------------------
 
-    def _scan_presets(self) -> list[str]:
-        if not PRESETS_DIR.is_dir():
-            return []
-        return sorted(
-            p.stem
-            for p in PRESETS_DIR.glob("*.py")
-            if p.stem != "__init__"
-        )
+    def _scan_presets(self) -> None:
+        # same discovery as the daemon's preset host; scans, never imports.
+        # Run when the list opens, so presets added meanwhile show up too.
+        self.preset_pick.configure(values=PresetRegistry().names())
 
     def _load_entities_async(self) -> None:
         def work():
-            url, token = get_credentials()
-            ha = HAClient(url, token)
-            if ha.passive:
+            if not len(self.entity_index):  # last session's list, until fresh
+                cached = EntityIndex(load_cache())
+                self.after(0, lambda: self._apply_entities(cached))
+            try:  # the daemon's live cache, no second HA fetch
+                reply = control.request("states")
+                states, areas = reply["states"], reply.get("areas")
+            except Exception:
+                states, areas = None, None
+            if not states:
+                from .ha_client import HAClient
+
+                url, token = get_credentials()
+                ha = HAClient(url, token)
+                if ha.passive:
+                    return
+                states = dict(ha.refresh_states(force=True))
+            if not states:
                 return
-            states = ha.refresh_states(force=True)
-            self.entities = sorted(states.keys())
-            self.after(0, self._apply_entities)
+            entities = entities_from_states(states, areas)
+            index = EntityIndex(entities)  # built here, off the Tk thread
+            save_cache(entities)
+            self.after(0, lambda: self._apply_entities(index))
 
         threading.Thread(target=work, daemon=True).start()
 
-    def _apply_entities(self) -> None:
-        self.entity_pick.configure(values=self.entities)
+    def _apply_entities(self, index: EntityIndex) -> None:
+        self.entity_index = index
+        self._entity_matches()
+
+    def _on_entity_typed(self, event=None) -> None:
+        if event is not None and event.keysym in ("Up", "Down", "Return", "Escape"):
+            return
+        if self._entity_search_job is not None:
+            self.after_cancel(self._entity_search_job)
+        self._entity_search_job = self.after(40, self._entity_matches)
+
+    def _entity_matches(self) -> None:
+        self._entity_search_job = None
+        self.entity_pick.configure(
+            values=self.entity_index.search(self.entity_pick.get()))
 
     # ---- rooms ---------------------------------------------------------
 
     def _render_room_rows(self) -> None:
-        for w in self._room_rows:
-            w.destroy()
-        self._room_rows = []
-        for idx, room in enumerate(self.config_model.rooms):
-            active = idx == self._room_active_idx
-            rowbg = PANEL2 if active else PANEL
-            row = tk.Frame(self.rooms_container, bg=rowbg, cursor="hand2")
-            row.pack(fill="x", pady=3)
-            self._room_rows.append(row)
-
-            accent = tk.Frame(row, bg=(GREEN if active else BEZEL), width=3, height=20)
-            accent.pack(side="left", padx=(9, 10), pady=9)
-            name = tk.Label(
-                row, text=room.name, bg=rowbg, fg=(INK if active else INK_DIM),
-                font=("DejaVu Sans", 11, "bold") if active else ("DejaVu Sans", 11),
-                anchor="w",
-            )
-            name.pack(side="left", fill="x", expand=True, pady=9)
-            cc = tk.Label(row, text=f"CC {room.room_key}", bg=WELL, fg=INK_DIM,
-                          font=FONT_EYE, padx=6, pady=2)
-            cc.pack(side="right", padx=(6, 10), pady=9)
-            n = len(room.actions)
-            if n:
-                badge = tk.Label(row, text=str(n), bg="#173322", fg="#7BE6A2",
-                                 font=FONT_EYE, padx=7, pady=2)
-                badge.pack(side="right", pady=9)
-            for w in (row, accent, name, cc):
-                w.bind("<Button-1>", lambda e, i=idx: self._select_room(i))
+        """Sync the room list with the config, touching only changed rows.
+
+        Row widgets are kept and reused by position; a row is restyled only
+        when its (active, name, key, count) state differs from what it shows.
+        """
+        rooms = self.config_model.rooms
+        while len(self._room_rows) > len(rooms):
+            self._room_rows.pop()[0].destroy()
+            self._room_shown.pop()
+        while len(self._room_rows) < len(rooms):
+            self._room_rows.append(self._create_room_row(len(self._room_rows)))
+            self._room_shown.append(None)
+        for idx in range(len(rooms)):
+            self._update_room_row(idx)
+
+    def _create_room_row(self, idx: int) -> tuple:
+        row = tk.Frame(self.rooms_container, bg=PANEL, cursor="hand2")
+        row.pack(fill="x", pady=3)
+        accent = tk.Frame(row, bg=BEZEL, width=3, height=20)
+        accent.pack(side="left", padx=(9, 10), pady=9)
+        name = tk.Label(row, bg=PANEL, fg=INK_DIM, font=("DejaVu Sans", 11), anchor="w")
+        name.pack(side="left", fill="x", expand=True, pady=9)
+        cc = tk.Label(row, bg=WELL, fg=INK_DIM, font=FONT_EYE, padx=6, pady=2)
+        cc.pack(side="right", padx=(6, 10), pady=9)
+        # packed on demand, always last so it sits left of the CC tag
+        badge = tk.Label(row, bg="#173322", fg="#7BE6A2", font=FONT_EYE, padx=7, pady=2)
+        for w in (row, accent, name, cc, badge):
+            w.bind("<Button-1>", lambda e, i=idx: self._select_room(i))
+        return row, accent, name, cc, badge
+
+    def _update_room_row(self, idx: int) -> None:
+        room = self.config_model.rooms[idx]
+        active = idx == self._room_active_idx
+        n = len(room.actions)
+        state = (active, room.name, room.room_key, n)
+        if self._room_shown[idx] == state:
+            return
+        old = self._room_shown[idx]
+        self._room_shown[idx] = state
+        row, accent, name, cc, badge = self._room_rows[idx]
+        rowbg = PANEL2 if active else PANEL
+        row.configure(bg=rowbg)
+        accent.configure(bg=(GREEN if active else BEZEL))
+        name.configure(
+            text=room.name, bg=rowbg, fg=(INK if active else INK_DIM),
+            font=("DejaVu Sans", 11, "bold") if active else ("DejaVu Sans", 11),
+        )
+        cc.configure(text=f"CC {room.room_key}")
+        badge.configure(text=str(n))
+        if n and not (old and old[3]):
+            badge.pack(side="right", pady=9)
+        elif not n and old and old[3]:
+            badge.pack_forget()
 
     def _select_room(self, idx: int) -> None:
-        self._room_active_idx = idx
-        self._render_room_rows()
+        prev, self._room_active_idx = self._room_active_idx, idx
+        for i in {prev, idx}:
+            if i is not None and i < len(self._room_rows):
+                self._update_room_row(i)
         self._on_room_select()
 
     def _refresh_rooms(self) -> None:
@@ -663,6 +948,7 @@ class ManageApp(tk.Tk):
         if idx is None:
             return
         self.current_room = self.config_model.rooms[idx]
+        self.current_page = 0
         self.current_action = None
         self.grid_room_var.set(self.current_room.name)
         self.room_key_var.set(str(self.current_room.room_key))
@@ -707,28 +993,54 @@ class ManageApp(tk.Tk):
 
     # ---- grid ----------------------------------------------------------
 
+    def _step_page(self, delta: int) -> None:
+        if not self.current_room:
+            return
+        self.current_page = max(
+            0, min(self.current_room.pages, self.current_page + delta))
+        self.current_action = None
+        self._clear_editor()
+
+    def _page_actions(self) -> list[Action]:
+        return [a for a in self.current_room.actions if a.page == self.current_page]
+
     def _refresh_grid(self) -> None:
+        self._draw_grid()
+
+    def _draw_grid(self) -> None:
+        if self._live_on and self._live_target != self._shown_page():
+            self._follow_live()  # room or page changed: follow the new one
         self.unplaced.delete(0, "end")
         self._unplaced_actions: list[Action] = []
-        pads: dict[tuple[int, int], tuple[str, int | None, str]] = {}
+        pads: dict[tuple[int, int], tuple] = {}  # (kind, color, label, mode)
+        hw: dict[tuple[bool, int], int] = {}  # the same picture, by pad number
+        live = self.live_pads if self._live_on else {}
         if not self.current_room:
+            self.page_var.set("")
             self.pad_grid.render(pads, None)
+            self._push_preview(hw)
             return
+        pages = max(self.current_room.pages, self.current_page + 1)
+        self.page_var.set(f"PAGE {self.current_page + 1}/{pages}")
 
         # room selectors across all rooms give spatial context; the active
         # room's own selector glows brighter so you can place yourself
         for room in self.config_model.rooms:
+            color = (room.room_key_color_any_on if room is self.current_room
+                     else room.room_key_color_off)
+            shown, hw[(True, room.room_key)], mode = self._live_look(
+                live.get((True, room.room_key)), color)
             cell = self.layout.cell_for_number(room.room_key, is_cc=True)
             if cell:
-                color = (room.room_key_color_any_on if room is self.current_room
-                         else room.room_key_color_off)
-                pads[cell] = ("selector", color, "RM")
+                pads[cell] = ("selector", shown, "RM", mode)
 
-        for act in self.current_room.actions:
+        for act in self._page_actions():
             cell = self.layout.cell_for_number(act.key)
             label = act.preset[:4] if act.is_preset else str(act.key)
+            shown, hw[(False, act.key)], mode = self._live_look(
+                live.get((False, act.key)), act.on_color)
             if cell:
-                pads[cell] = ("macro", act.on_color, label)
+                pads[cell] = ("macro", shown, label, mode)
             else:
                 self._unplaced_actions.append(act)
                 self.unplaced.insert("end", f"{act.key}  {label}")
@@ -736,13 +1048,149 @@ class ManageApp(tk.Tk):
         selected = (self.layout.cell_for_number(self.current_action.key)
                     if self.current_action else None)
         self.pad_grid.render(pads, selected)
+        self._push_preview(hw)
+
+    # ---- hardware preview ----------------------------------------------
+
+    def _toggle_preview(self) -> None:
+        self._preview_on = not self._preview_on
+        self._preview_btn.configure(
+            style="Live.TButton" if self._preview_on else "Ghost.TButton")
+        if self._preview_on:
+            self._draw_grid()
+        elif self.midi.outport is not None:
+            self.midi.show({})
+        elif self._preview_sent is not None:
+            self._send_preview(frame=[])  # drop the daemon's preview layer
+        self._preview_sent = None
+
+    def _push_preview(self, hw: dict[tuple[bool, int], int]) -> None:
+        """Mirror the edited page on the Launchpad as one batched frame."""
+        if not self._preview_on or self.map_capture is not None:
+            return  # the layout wizard owns the pads while it runs
+        if self.midi.outport is not None:
+            self.midi.show(hw)  # diffed against what the device shows
+            return
+        # the daemon holds the port: the page goes on its preview layer,
+        # above the room, until Preview is switched off; after the first
+        # frame only the pads that changed are sent
+        sent = self._preview_sent
+        if sent is None:
+            self._send_preview(frame=[
+                {"key": n, "color": c, "is_cc": is_cc} for (is_cc, n), c in hw.items()])
+        else:
+            patch = [{"key": n, "color": c, "is_cc": is_cc}
+                     for (is_cc, n), c in hw.items() if sent.get((is_cc, n)) != c]
+            patch += [{"key": n, "color": None, "is_cc": is_cc}
+                      for (is_cc, n) in sent.keys() - hw.keys()]
+            if not patch:
+                return
+            self._send_preview(patch=patch)
+        self._preview_sent = hw
+
+    def _send_preview(self, **args) -> None:
+        # one sender thread, so a patch never overtakes the frame it amends
+        if self._preview_thread is None:
+            self._preview_thread = threading.Thread(
+                target=self._preview_worker, name="lp-preview", daemon=True)
+            self._preview_thread.start()
+        self._preview_jobs.put(args)
+
+    def _preview_worker(self) -> None:
+        while True:
+            self._daemon_request("preview", **self._preview_jobs.get())
+
+    # ---- live state mirror ---------------------------------------------
+
+    @staticmethod
+    def _live_look(look: tuple[int, str] | None, color: int):
+        """(grid color, palette velocity, mode) of a pad: the daemon's look
+        when Live has one, else the edited `color`."""
+        if look is None:
+            return color, color, None
+        value, mode = look
+        if mode == "rgb":  # exact color mirrored from HA, 0xRRGGBB
+            shown = ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
+            return shown, nearest(shown), mode
+        return value, value, mode
+
+    def _shown_page(self) -> tuple[str, int] | None:
+        if not self.current_room:
+            return None
+        return self.current_room.name, self.current_page
+
+    def _toggle_live(self) -> None:
+        self._live_on = not self._live_on
+        self._live_btn.configure(style="Live.TButton" if self._live_on else "Ghost.TButton")
+        self._follow_live()
+        self._draw_grid()
+
+    def _follow_live(self) -> None:
+        """(Re)subscribe to the daemon's rendering of the shown page.
+
+        One connection per followed page: the daemon sends the whole page,
+        then only pads whose look changed, as it renders them for the
+        Launchpad (pending, running, unavailable, mirrored colors, modes).
+        """
+        self._live_gen += 1
+        if self._live_sub is not None:
+            self._live_sub.close()
+            self._live_sub = None
+        self.live_pads = {}
+        self._live_target = self._shown_page() if self._live_on else None
+        if self._live_target is None:
+            return
+        gen, (room, page) = self._live_gen, self._live_target
+
+        def work():
+            gone = "Live state needs the running daemon"
+            try:
+                sub = control.Subscription("frame", room=room, page=page)
+            except OSError:
+                self.after(0, lambda: self._live_failed(gen, gone))
+                return
+            self.after(0, lambda: self._live_attached(gen, sub))
+            try:
+                for update in sub:
+                    self.after(0, lambda u=update: self._apply_live(gen, u))
+            except RuntimeError as e:  # e.g. a room the daemon hasn't got yet
+                gone = f"Live: {e} (save to send it to the daemon)"
+            except Exception:
+                pass
+            self.after(0, lambda: self._live_failed(gen, gone))
+
+        threading.Thread(target=work, name="lp-live", daemon=True).start()
+
+    def _live_attached(self, gen: int, sub: control.Subscription) -> None:
+        if gen != self._live_gen:
+            sub.close()  # followed something else meanwhile
+        else:
+            self._live_sub = sub
+
+    def _apply_live(self, gen: int, update: dict) -> None:
+        if gen != self._live_gen:
+            return  # a stream we already left
+        if update.get("full"):
+            self.live_pads = {}
+        for pad in update.get("pads", ()):
+            key = (bool(pad["is_cc"]), int(pad["key"]))
+            if pad["color"] is None:
+                self.live_pads.pop(key, None)
+            else:
+                self.live_pads[key] = (int(pad["color"]), pad["mode"])
+        self._draw_grid()  # PadGrid repaints only cells that changed
+
+    def _live_failed(self, gen: int, message: str) -> None:
+        if self._live_on and gen == self._live_gen:
+            self._toggle_live()
+            self.status_var.set(message)
 
     def _on_cell(self, r: int, c: int) -> None:
         if not self.current_room:
             return
         number = self.layout.number_for_cell(r, c)
         act = next(
-            (a for a in self.current_room.actions
+            (a for a in self._page_actions()
              if self.layout.cell_for_number(a.key) == (r, c)),
             None,
         )
@@ -751,7 +1199,8 @@ class ManageApp(tk.Tk):
                 return
             if not messagebox.askyesno("New macro", f"Add a macro on pad {number}?"):
                 return
-            act = Action(key=number, on_color=21, off_color=5, entity_ids=[])
+            act = Action(key=number, on_color=21, off_color=5, entity_ids=[],
+                         page=self.current_page)
             self.current_room.actions.append(act)
         self._edit_action(act)
 
@@ -842,21 +1291,30 @@ class ManageApp(tk.Tk):
         self.learn_target = entry_widget
         self.status_var.set("Learn: press a Launchpad button...")
 
-    def _poll_midi(self) -> None:
+    def _watch_midi(self) -> None:
+        # Wake only when the bridge has something; Tk builds without file
+        # handlers (Windows) fall back to polling.
         try:
-            while True:
-                kind, number = self.midi.events.get_nowait()
-                if self.map_capture is not None:
-                    self.map_capture(kind, number)
-                elif self.learn_target is not None:
-                    self.learn_target.delete(0, "end")
-                    self.learn_target.insert(0, str(number))
-                    self.learn_target = None
-                    self.status_var.set(f"Captured {kind} {number}")
-        except queue.Empty:
-            pass
+            self.tk.createfilehandler(
+                self.midi.wakeup_fd, tk.READABLE,
+                lambda fd, mask: self._on_midi_events())
+        except (AttributeError, tk.TclError):
+            self._poll_midi()
+
+    def _poll_midi(self) -> None:
+        self._on_midi_events()
         self.after(50, self._poll_midi)
 
+    def _on_midi_events(self) -> None:
+        for kind, number in self.midi.drain():
+            if self.map_capture is not None:
+                self.map_capture(kind, number)
+            elif self.learn_target is not None:
+                self.learn_target.delete(0, "end")
+                self.learn_target.insert(0, str(number))
+                self.learn_target = None
+                self.status_var.set(f"Captured {kind} {number}")
+
     def _map_layout(self) -> None:
         if self.midi.inport is None:
             messagebox.showwarning(
@@ -878,7 +1336,7 @@ class ManageApp(tk.Tk):
         self.led.itemconfigure(self._led_dot, fill=color)
 
     def _connect_async(self) -> None:
-        if mido is None:
+        if not HAVE_MIDO:
             self._update_led()
             return
         self.status_var.set("connecting...")
@@ -944,6 +1402,8 @@ class ManageApp(tk.Tk):
             status.configure(text="Testing...", fg=INK_DIM)
 
             def work():
+                from .ha_client import HAClient
+
                 ha = HAClient(u or None, t or None)
                 if ha.passive:
                     msg, col = "Enter both a URL and a token.", AMBER
@@ -975,7 +1435,12 @@ class ManageApp(tk.Tk):
     def _pick_color(self, var) -> None:
         """Popup grid of all 128 Launchpad palette swatches; click to set var.
 
+        The grid is one cached image (`Swatches.sheet`); hover and selection
+        are rings moved over it, so opening and hovering redraw nothing.
+
         Lights the pad live on click if the daemon is stopped (device held).
+        "Match RGB" maps any color to its nearest swatch with the same table
+        the daemon uses to mirror light colors.
         """
         win = tk.Toplevel(self)
         win.title("Pick pad color")
@@ -987,53 +1452,88 @@ class ManageApp(tk.Tk):
         frm = tk.Frame(win, bg=PANEL)
         frm.pack(fill="both", expand=True, padx=14, pady=12)
 
-        cols, cell, gap = 16, 26, 3
-        cv = tk.Canvas(frm, bg=PANEL, highlightthickness=0,
-                       width=cols * (cell + gap) + gap,
-                       height=8 * (cell + gap) + gap)
+        sw = self.swatches
+        w, h = sw.size()
+        cv = tk.Canvas(frm, bg=PANEL, highlightthickness=0, width=w, height=h)
         cv.pack()
+        # the pre-rendered sheet plus two rings moved over it
+        cv.create_image(0, 0, anchor="nw", image=sw.sheet)
+        hover = cv.create_rectangle(0, 0, 0, 0, outline=INK_DIM, state="hidden")
+        ring = cv.create_rectangle(0, 0, 0, 0, outline=SELECT, width=2)
 
         sel = {"v": var.get()}
 
+        def place(item, i):
+            x0, y0 = sw.origin(i)
+            cv.coords(item, x0, y0, x0 + sw.CELL, y0 + sw.CELL)
+
         def draw():
-            cv.delete("all")
-            for i in range(128):
-                r, c = divmod(i, cols)
-                x0 = gap + c * (cell + gap)
-                y0 = gap + r * (cell + gap)
-                col = rgb(i)
-                chosen = i == sel["v"]
-                cv.create_rectangle(
-                    x0, y0, x0 + cell, y0 + cell, fill=to_hex(col),
-                    outline=SELECT if chosen else to_hex(mix(col, CHASSIS_RGB, 0.5)),
-                    width=2 if chosen else 1)
+            place(ring, sel["v"])
+
+        def motion(e):
+            i = sw.index_at(e.x, e.y)
+            if i is None or i == sel["v"]:
+                cv.itemconfigure(hover, state="hidden")
+            else:
+                place(hover, i)
+                cv.itemconfigure(hover, state="normal")
 
         def click(e):
-            c = int((e.x - gap) // (cell + gap))
-            r = int((e.y - gap) // (cell + gap))
-            i = r * cols + c
-            if 0 <= c < cols and 0 <= i < 128:
+            i = sw.index_at(e.x, e.y)
+            if i is not None:
                 sel["v"] = i
                 var.set(i)
                 draw()
+                cv.itemconfigure(hover, state="hidden")
                 self._test_color(var)
 
         cv.bind("<Button-1>", click)
+        cv.bind("<Motion>", motion)
+        cv.bind("<Leave>", lambda _e: cv.itemconfigure(hover, state="hidden"))
 
         tk.Label(frm, text="Click a swatch — lights the pad live if the daemon "
                  "is stopped.", fg=INK_DIM, bg=PANEL,
                  font=("DejaVu Sans", 8)).pack(anchor="w", pady=(8, 0))
 
+        def match_rgb():
+            _, picked = colorchooser.askcolor(
+                color=hex_color(sel["v"]), parent=win, title="Match RGB")
+            if not picked:
+                return
+            i = nearest(tuple(int(picked[k:k + 2], 16) for k in (1, 3, 5)))
+            sel["v"] = i
+            var.set(i)
+            draw()
+            self._test_color(var)
+
         btns = tk.Frame(frm, bg=PANEL)
         btns.pack(fill="x", pady=(8, 0))
         ttk.Button(btns, text="Done", style="Live.TButton",
                    command=win.destroy).pack(side="right")
+        ttk.Button(btns, text="Match RGB…", style="Ghost.TButton",
+                   command=match_rgb).pack(side="left")
         draw()
 
     def _test_color(self, var) -> None:
         if not self.current_action:
             return
-        self.midi.light(self.current_action.key, var.get(), False)
+        if self.midi.outport is not None:
+            self.midi.light(self.current_action.key, var.get(), False)
+            return
+        # the daemon holds the port: ask it to show the color for a moment
+        key, color = self.current_action.key, var.get()
+        threading.Thread(
+            target=lambda: self._daemon_request(
+                "preview", key=key, color=color, duration=1.5),
+            daemon=True,
+        ).start()
+
+    @staticmethod
+    def _daemon_request(cmd: str, **args) -> dict | None:
+        try:
+            return control.request(cmd, **args)
+        except Exception:
+            return None
 
     # ---- persistence ---------------------------------------------------
 
@@ -1043,6 +1543,28 @@ class ManageApp(tk.Tk):
         except Exception as e:
             messagebox.showerror("Save failed", str(e))
             return
+        try:
+            control.request("config", config=self.config_model.to_dict(), save=False)
+        except RuntimeError as e:  # daemon is up but rejected the config
+            messagebox.showwarning(
+                "Saved (not applied)",
+                f"config.json written, but the daemon rejected it:\n{e}",
+            )
+            return
+        except (FileNotFoundError, ConnectionRefusedError):
+            pass  # no daemon listening: fall back to a restart
+        except Exception as e:  # a daemon is up but busy (timeout, cut reply)
+            messagebox.showwarning(
+                "Saved (not confirmed)",
+                "config.json written, but the running daemon did not confirm "
+                f"it ({e or type(e).__name__}). It reloads config.json on its "
+                "own when the file changes.",
+            )
+            return
+        else:
+            messagebox.showinfo(
+                "Saved", "config.json written and applied by the running daemon.")
+            return
         ok, detail = self._restart_service()
         if ok:
             messagebox.showinfo(
@@ -1119,8 +1641,7 @@ class ManageApp(tk.Tk):
         try:
             with open(path) as f:
                 data = json.load(f)
-            rooms = [Room.from_dict(r) for r in data.get("rooms", [])]
-            self.config_model = Config(rooms=rooms)
+            self.config_model = Config.from_dict(data)
             self._refresh_rooms()
             messagebox.showinfo("Imported", f"Successfully imported config from:\n{path}\n\nClick 'Save config' to apply.")
         except Exception as e:
@@ -1131,6 +1652,14 @@ class ManageApp(tk.Tk):
         self._refresh_rooms()
 
     def _on_close(self) -> None:
+        try:
+            self.tk.deletefilehandler(self.midi.wakeup_fd)
+        except (AttributeError, tk.TclError):
+            pass
+        if self._live_sub is not None:
+            self._live_sub.close()
+        if self._preview_sent is not None:
+            self._daemon_request("preview", frame=[])  # don't leave it held
         self.midi.close()
         self.destroy()
 
@@ -1148,6 +1677,7 @@ class LayoutWizard(tk.Toplevel):
     """
 
     MAP_COLOR = 21  # green swatch for an already-mapped cell
+    SWEEP_COLOR = 13  # yellow: mapped pads in the target's row and column
 
     def __init__(self, app: "ManageApp"):
         super().__init__(app)
@@ -1204,6 +1734,7 @@ class LayoutWizard(tk.Toplevel):
             pads[(r, c)] = ("map", self.MAP_COLOR, label)
         target = self.order[self.idx] if self.idx < len(self.order) else None
         self.grid_view.render(pads, target)
+        self._sweep(target)
         if target is None:
             self.prompt.set("All positions visited — Finish & save, or click a "
                             "cell to redo it.")
@@ -1215,6 +1746,15 @@ class LayoutWizard(tk.Toplevel):
                             f"[{self.idx + 1}/{len(self.order)}]{note} — "
                             f"press its button")
 
+    def _sweep(self, target: tuple[int, int] | None) -> None:
+        # The device mirrors the wizard: every mapped pad lit, the target's
+        # row and column highlighted so it can be found — one batched frame.
+        frame = {}
+        for (r, c), (is_cc, num) in self.work.as_dict().items():
+            crossing = target is not None and (r == target[0] or c == target[1])
+            frame[(is_cc, num)] = self.SWEEP_COLOR if crossing else self.MAP_COLOR
+        self.app.midi.show(frame)
+
     # ---- events --------------------------------------------------------
 
     def _on_press(self, kind: str, number: int) -> None:
@@ -1223,8 +1763,7 @@ class LayoutWizard(tk.Toplevel):
         r, c = self.order[self.idx]
         is_cc = kind == "cc"
         self.work.set_cell(r, c, number, is_cc)
-        self.app.midi.light(number, self.MAP_COLOR, is_cc)  # confirm blink
-        self._advance()
+        self._advance()  # the sweep lights the new pad as confirmation
 
     def _on_cell_click(self, r: int, c: int) -> None:
         if (r, c) in self.order:
@@ -1262,8 +1801,10 @@ class LayoutWizard(tk.Toplevel):
 
     def _teardown(self) -> None:
         self.app.map_capture = None
+        self.app.midi.show({})
         self.grab_release()
         self.destroy()
+        self.app._draw_grid()  # hand the pads back to the room preview
 
 
 def main() -> None:
@@ -0,0 +1,180 @@
+"""Daemon internals in the Prometheus text exposition format.
+
+Hot paths only bump plain integer attributes (`compositor.sent`,
+`ha.ws_frames`, `controller.repaints`, ...); nothing here runs on them.
+`MetricsExporter.text()` reads those attributes when it is asked — by the
+control socket's `prometheus` command — and `sample()`, run by the
+scheduler every METRICS_INTERVAL, turns counters into per-second rates,
+measures how late the scheduler ran it, and, with "launchpad_metrics_file"
+set in settings.json, rewrites that file for node_exporter's textfile
+collector: world-readable (the collector runs as its own user) and
+replaced atomically, but without fsyncs, which could stall the scheduler
+on slow storage.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .latency import PERCENTILES
+from .storage import write_text
+
+if TYPE_CHECKING:
+    from .app import Controller
+
+METRICS_INTERVAL = 5.0  # seconds between samples / file rewrites
+
+PREFIX = "launchpad_"
+
+# permissions of the metrics file
+METRICS_FILE_MODE = 0o644
+
+# (labels, value) samples of one metric; a third item is a name suffix,
+# e.g. a summary's "_count" and "_sum"
+Samples = list[tuple]
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))  # counters stay exact
+    return repr(float(value))
+
+
+def render(families: list[tuple[str, str, str, Samples]]) -> str:
+    """Text format for `(name, type, help, samples)` metric families."""
+    lines = []
+    for name, kind, doc, samples in families:
+        lines.append(f"# HELP {PREFIX}{name} {doc}")
+        lines.append(f"# TYPE {PREFIX}{name} {kind}")
+        for labels, value, *suffix in samples:
+            metric = PREFIX + name + "".join(suffix)
+            lines.append(f"{metric}{_labels(labels)} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    def __init__(self, controller: "Controller", path: Path | None = None):
+        self.ctl = controller
+        self.path = path
+        self._lock = threading.Lock()
+        self._last: tuple[float, int, int] | None = None  # (t, ws_frames, applied)
+        self._due: float | None = None
+        self.ws_fps = 0.0
+        self.applied_per_s = 0.0
+        self.lag = 0.0
+        self.loop_max = 0.0
+
+    def sample(self) -> None:
+        """Scheduler step: refresh rates and rewrite the metrics file."""
+        now = time.monotonic()
+        ha = self.ctl.ha
+        with self._lock:
+            if self._due is not None:
+                self.lag = max(0.0, now - self._due)
+            self._due = now + METRICS_INTERVAL
+            if self._last is not None:
+                t, frames, applied = self._last
+                dt = max(now - t, 1e-6)
+                self.ws_fps = (ha.ws_frames - frames) / dt
+                self.applied_per_s = (ha.events_applied - applied) / dt
+            self._last = (now, ha.ws_frames, ha.events_applied)
+            self.loop_max, self.ctl.loop_max = self.ctl.loop_max, 0.0
+        if self.path is None:
+            return
+        try:
+            write_text(self.path, self.text(), mode=METRICS_FILE_MODE, durable=False)
+        except Exception as e:
+            print(f"❌ Metrics file error: {e}")
+            self.path = None  # report once, don't retry every interval
+
+    def text(self) -> str:
+        return render(self.collect())
+
+    def collect(self) -> list[tuple[str, str, str, Samples]]:
+        ctl, ha = self.ctl, self.ctl.ha
+        surfaces = ctl.surfaces
+
+        def per(fn) -> Samples:
+            return [({"surface": s.name}, fn(s)) for s in surfaces]
+
+        queues: Samples = [({"queue": "scheduler"}, ctl.scheduler.queued())]
+        queues += [({"queue": f"led_frame:{s.name}"}, s.compositor.backlog)
+                   for s in surfaces]
+        io = getattr(ctl, "io", None)  # asyncio runtime's worker pool
+        if io is not None:
+            queues.append(({"queue": "io_executor"}, io.backlog))
+
+        latency: Samples = []
+        totals = ctl.latency.totals()
+        for span, row in ctl.latency.report().items():
+            if row["count"]:
+                latency += [({"span": span, "quantile": f"{p / 100:g}"}, row[f"p{p}"] / 1000)
+                            for p in PERCENTILES]
+            count, seconds = totals[span]
+            latency += [({"span": span}, count, "_count"),
+                        ({"span": span}, round(seconds, 6), "_sum")]
+
+        return [
+            ("ws_frames_total", "counter",
+             "WebSocket messages received from Home Assistant.",
+             [({}, ha.ws_frames)]),
+            ("ws_frames_per_second", "gauge",
+             f"WebSocket messages per second over the last {METRICS_INTERVAL:g}s.",
+             [({}, round(self.ws_fps, 3))]),
+            ("state_deltas_applied_total", "counter",
+             "state_changed events applied to the state store.",
+             [({}, ha.events_applied)]),
+            ("state_deltas_per_second", "gauge",
+             f"Applied state_changed events per second over the last {METRICS_INTERVAL:g}s.",
+             [({}, round(self.applied_per_s, 3))]),
+            ("entities", "gauge", "Entities in the state cache.",
+             [({}, len(ha.states))]),
+            ("repaints_total", "counter", "Full pad repaints handed to the compositors.",
+             [({}, ctl.repaints)]),
+            ("midi_messages_sent_total", "counter", "Pad updates sent to the device.",
+             per(lambda s: s.compositor.sent)),
+            ("midi_messages_suppressed_total", "counter",
+             "Pad updates dropped because the device already showed them.",
+             per(lambda s: s.compositor.suppressed)),
+            ("midi_connected", "gauge", "Whether the surface's MIDI port is open.",
+             per(lambda s: int(s.connected))),
+            ("midi_connects_total", "counter", "MIDI port (re)opens.",
+             per(lambda s: s.connects)),
+            ("ws_connects_total", "counter", "WebSocket (re)connections to Home Assistant.",
+             [({}, ha.ws_connects)]),
+            ("ha_calls_in_flight", "gauge", "Service calls sent but not yet answered.",
+             [({}, ha.in_flight)]),
+            ("queue_depth", "gauge", "Items waiting in internal queues.", queues),
+            ("press_latency_seconds", "summary",
+             "Press latency per span; quantiles over the recent window.", latency),
+            ("threads", "gauge", "Live Python threads.",
+             [({}, threading.active_count())]),
+            ("scheduler_lag_seconds", "gauge",
+             "How late the scheduler ran the last metrics sample.",
+             [({}, round(self.lag, 6))]),
+            ("effect_scale", "gauge", "Preset pacing scale from the rate controller.",
+             [({}, ctl.rate.scale)]),
+            # threaded runtime: passes of the main loop; asyncio runtime:
+            # daemon callbacks on the event loop (MIDI, timers, repaints)
+            ("loop_iterations_total", "counter", "Main loop iterations.",
+             [({}, ctl.loop_iterations)]),
+            ("loop_busy_seconds_total", "counter",
+             "Time spent in main loop iterations, excluding idle waits.",
+             [({}, round(ctl.loop_seconds, 6))]),
+            ("loop_iteration_max_seconds", "gauge",
+             "Longest main loop iteration since the previous sample.",
+             [({}, round(self.loop_max, 6))]),
+        ]
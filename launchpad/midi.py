@@ -5,6 +5,7 @@ LED output. Never lets exceptions escape into the main loop.
 from __future__ import annotations
 
 import time
+from typing import Callable
 
 import mido
 
@@ -12,31 +13,42 @@ from . import device
 
 
 class MidiSurface:
-    def __init__(self):
+    def __init__(self, port: str | None = None, sysex_frames: bool = False):
+        self.port = port  # port-name substring picking one of several units
+        # send multi-pad frames as one SysEx (LEDs in Programmer numbering)
+        self.sysex_frames = sysex_frames
         self.inport = None
         self.outport = None
         self.in_name: str | None = None
         self.out_name: str | None = None
 
-    def open(self) -> None:
-        """Block until both Launchpad in/out ports appear, then open them."""
-        while True:
-            ins = mido.get_input_names()
-            outs = mido.get_output_names()
-
-            in_name = device.pick_launchpad_port(ins)
-            out_name = device.pick_launchpad_port(outs)
-
-            if in_name and out_name:
-                self.inport = mido.open_input(in_name)
-                self.outport = mido.open_output(out_name)
-                self.in_name = in_name
-                self.out_name = out_name
-                print(f"✅ Connected: {in_name}")
-                return
+    def open(self, callback: Callable | None = None) -> None:
+        """Block until both Launchpad in/out ports appear, then open them.
 
+        With `callback`, input is pushed to it from the MIDI backend's own
+        thread instead of being queued for `iter_pending`.
+        """
+        while not self.try_open(callback):
             time.sleep(1)
 
+    def try_open(self, callback: Callable | None = None) -> bool:
+        """One non-blocking attempt at `open`; False if the ports are absent."""
+        try:
+            in_name = device.pick_launchpad_port(mido.get_input_names(), self.port)
+            out_name = device.pick_launchpad_port(mido.get_output_names(), self.port)
+            if not (in_name and out_name):
+                return False
+            self.inport = mido.open_input(in_name, callback=callback)
+            self.outport = mido.open_output(out_name)
+        except Exception:
+            self.close()
+            self.inport = self.outport = None
+            return False
+        self.in_name = in_name
+        self.out_name = out_name
+        print(f"✅ Connected: {in_name}")
+        return True
+
     def still_present(self) -> bool:
         try:
             return (
@@ -58,15 +70,41 @@ class MidiSurface:
         except Exception:
             pass
 
-    def set_pad(self, key: int, val: int, is_cc: bool) -> None:
+    def set_pad(self, key: int, val: int, is_cc: bool, mode: int = device.STATIC) -> None:
+        """Light a pad; `mode` is device.STATIC / FLASH / PULSE, or
+        device.RGB with `val` a packed 0xRRGGBB color."""
         if not self.outport:
             return
+        if mode == device.RGB:
+            self.outport.send(mido.Message("sysex", data=device.rgb_sysex(key, val)))
+            return
         self.outport.send(
-            mido.Message("control_change", control=key, value=val)
+            mido.Message("control_change", channel=mode, control=key, value=val)
             if is_cc
-            else mido.Message("note_on", note=key, velocity=val)
+            else mido.Message("note_on", channel=mode, note=key, velocity=val)
         )
 
+    def set_pads(self, pads: list[tuple[tuple[bool, int], tuple[int, int]]]) -> None:
+        """Light a frame of `((is_cc, number), (color, mode))` pads.
+
+        With `sysex_frames`, everything but flashing pads goes out as a
+        single SysEx; otherwise each pad is its own message.
+        """
+        if not self.outport:
+            return
+        if not (self.sysex_frames and len(pads) > 1):
+            for (is_cc, number), (color, mode) in pads:
+                self.set_pad(number, color, is_cc, mode)
+            return
+        leds = []
+        for (is_cc, number), (color, mode) in pads:
+            if mode == device.FLASH:
+                self.set_pad(number, color, is_cc, mode)
+            else:
+                leds.append((number, color, mode))
+        if leds:
+            self.outport.send(mido.Message("sysex", data=device.lighting_sysex(leds)))
+
     def close(self) -> None:
         try:
             if self.inport:
@@ -1,9 +1,14 @@
 """RGB for Launchpad Mini MK3 velocity colors (0-127).
 
-Used only to draw swatches in the manage GUI. Exact color always comes from
+Used to draw swatches in the manage GUI, and to map arbitrary RGB (e.g. a
+light's HA `rgb_color`) back onto the palette. Exact color always comes from
 the device itself (the manage app can light a pad to preview). These are the
 actual palette RGBs from Novation's Launchpad Mini MK3 programmer reference,
 so the on-screen swatches match the hardware instead of a saturated guess.
+
+`nearest(rgb)` picks the perceptually closest palette index (OKLab
+distance). Matches come from a LUT_LEVELS^3 table built once on first use,
+so every later lookup is an index into bytes, not a search of the palette.
 """
 
 from __future__ import annotations
@@ -46,6 +51,59 @@ _PALETTE: tuple[tuple[int, int, int], ...] = (
 )
 
 
+# grid points per channel of the nearest-color table (0 and 255 included)
+LUT_LEVELS = 17
+
+_lut: bytes | None = None
+
+
+def _oklab(rgb_tuple: tuple[float, float, float]) -> tuple[float, float, float]:
+    def lin(c: float) -> float:
+        c /= 255.0
+        return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+    r, g, b = (lin(c) for c in rgb_tuple)
+    l = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+    return (
+        0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+        1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+        0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s,
+    )
+
+
+def build_lut() -> bytes:
+    """Build (once) the quantized RGB -> palette index table."""
+    global _lut
+    if _lut is None:
+        # index 0 is "off": a lit light never maps to a dark pad
+        targets = [(i, _oklab(_PALETTE[i])) for i in range(1, 128)]
+        step = 255 / (LUT_LEVELS - 1)
+        table = bytearray(LUT_LEVELS ** 3)
+        n = 0
+        for ri in range(LUT_LEVELS):
+            for gi in range(LUT_LEVELS):
+                for bi in range(LUT_LEVELS):
+                    L, a, b = _oklab((ri * step, gi * step, bi * step))
+                    table[n] = min(
+                        targets,
+                        key=lambda t: (t[1][0] - L) ** 2 + (t[1][1] - a) ** 2
+                        + (t[1][2] - b) ** 2,
+                    )[0]
+                    n += 1
+        _lut = bytes(table)
+    return _lut
+
+
+def nearest(rgb_tuple: tuple[int, int, int]) -> int:
+    """Palette index (1-127) closest to an (r, g, b) 0-255 color."""
+    lut = _lut or build_lut()
+    top = LUT_LEVELS - 1
+    r, g, b = ((max(0, min(255, int(c))) * top + 127) // 255 for c in rgb_tuple)
+    return lut[(r * LUT_LEVELS + g) * LUT_LEVELS + b]
+
+
 def rgb(velocity: int) -> tuple[int, int, int]:
     """Return the (r, g, b) 0-255 color for a Launchpad palette index."""
     v = max(0, min(127, int(velocity)))
@@ -0,0 +1,223 @@
+"""Preset host: lifecycle, isolation and budgets for `presets/<name>.py`.
+
+A preset module declares:
+
+    start(ha)        begin the effect; schedule timed steps on ha.effect
+    stop(ha)         optional cleanup (pending steps are already cancelled)
+    is_running(ha)   optional; whether a press should stop rather than start
+
+Modules exposing only the older `run(ha)` are hosted as one-shot presets.
+
+Every start gets its own PresetHA bound to a fresh scheduler Effect, so a
+run's state lives on that object instead of in module globals. Loading
+(a re-import when the file changed), start and stop execute as scheduler
+steps, never on the MIDI input path, and every step is metered: a preset spending more than its CPU budget (CPU seconds per second)
+is stopped, and HA calls beyond its call budget (per second) are dropped.
+A module may set CPU_BUDGET / CALL_BUDGET to override the defaults.
+
+When the daemon has a pad compositor, each run also gets `ha.canvas` to
+draw on the Launchpad; whatever it drew is cleared when the run ends.
+
+Modules come from a PresetRegistry (preloaded, re-imported on mtime
+change); a changed preset's running instance is stopped before reload.
+
+`on_change` (if set) is called whenever a preset starts or ends, so the
+daemon can repaint pads that show a preset's running state.
+
+All public methods return immediately: `is_running` reads state cached
+after the preset's last step, and `stop` cancels pending steps in place
+before scheduling the module's cleanup.
+"""
+
+from __future__ import annotations
+
+import time
+from functools import partial
+from types import ModuleType
+from typing import Callable
+
+from .compositor import Canvas
+from .ha_client import HAClient
+from .preset_registry import PresetRegistry
+from .presets_api import PresetHA
+from .ratecontrol import RateController
+from .scheduler import Effect, Scheduler
+
+# default budgets; modules override with CPU_BUDGET / CALL_BUDGET
+CPU_BUDGET = 0.25  # CPU seconds per wall second
+CALL_BUDGET = 200  # HA service calls per second
+
+# seconds over which the CPU budget is measured
+BUDGET_WINDOW = 1.0
+
+
+class _Run:
+    """Book-keeping for one started preset."""
+
+    def __init__(self, name: str, module: ModuleType, ha: PresetHA):
+        self.name = name
+        self.module = module
+        self.ha = ha
+        self.alive = True
+        self.cpu_window = time.monotonic()
+        self.cpu_spent = 0.0
+
+
+class PresetHost:
+    def __init__(
+        self,
+        ha: HAClient,
+        scheduler: Scheduler,
+        registry: PresetRegistry | None = None,
+        rate: RateController | None = None,
+        canvas: Callable[[], Canvas] | None = None,
+    ):
+        self.ha = ha
+        self._new_canvas = canvas
+        self.scheduler = scheduler
+        self.rate = rate
+        self.registry = registry or PresetRegistry()
+        self.registry.on_reload = self.stop
+        self._runs: dict[str, _Run] = {}
+        self.on_change: Callable[[], None] | None = None
+
+    # ---- loading -------------------------------------------------------
+
+    def _load(self, name: str) -> ModuleType:
+        return self.registry.get(name)
+
+    # ---- lifecycle -----------------------------------------------------
+
+    def press(self, name: str) -> None:
+        """Toggle a preset from a pad press: stop it if running, else start.
+
+        Only queues the toggle; it is decided and done on the scheduler.
+        """
+        self.scheduler.call_soon(self._toggle, name)
+
+    def start(self, name: str) -> None:
+        """Queue a (re)start of `name`; the module is loaded on the scheduler."""
+        self.scheduler.call_soon(self._start, name)
+
+    def _toggle(self, name: str) -> None:
+        if self.is_running(name):
+            self.stop(name)
+        else:
+            self._start(name)
+
+    def _start(self, name: str) -> None:
+        try:
+            module = self._load(name)
+        except Exception as e:
+            print(f"❌ Preset error [{name}]: {e}")
+            return
+        self.stop(name)
+
+        fx = self.scheduler.start(name)
+        ha = PresetHA(
+            self.ha,
+            self.scheduler,
+            name=name,
+            effect=fx,
+            host=self,
+            call_budget=getattr(module, "CALL_BUDGET", CALL_BUDGET),
+            rate=self.rate,
+            canvas=self._new_canvas() if self._new_canvas else None,
+        )
+        run = _Run(name, module, ha)
+        self._runs[name] = run
+        fx.on_step = partial(
+            self._meter, run, getattr(module, "CPU_BUDGET", CPU_BUDGET)
+        )
+        entry = getattr(module, "start", None) or module.run
+        fx.call_soon(self._call, run, entry)
+        self._changed()
+
+    def stop(self, name: str) -> bool:
+        """Stop `name` now; its cleanup runs on the scheduler. Non-blocking."""
+        run = self._runs.pop(name, None)
+        if run is None:
+            return False
+        self._end(run)
+        cleanup = getattr(run.module, "stop", None)
+        if cleanup is not None and hasattr(run.module, "start"):
+            run.ha.call_budget = None  # cleanup (e.g. lights off) must finish
+            self.scheduler.call_soon(self._call, run, cleanup)
+        return True
+
+    def stop_all(self) -> None:
+        for name in list(self._runs):
+            self.stop(name)
+
+    def is_running(self, name: str) -> bool:
+        run = self._runs.get(name)
+        return run is not None and run.alive
+
+    def running(self) -> list[str]:
+        return [name for name, run in self._runs.items() if run.alive]
+
+    def status(self) -> dict[str, dict]:
+        return {
+            name: {
+                "cpu_s": round(run.ha.effect.cpu_time, 4),
+                "calls": run.ha.calls,
+                "dropped": run.ha.dropped,
+                **run.ha.frame_stats(),
+            }
+            for name, run in self._runs.items()
+            if run.alive
+        }
+
+    # ---- scheduler side ------------------------------------------------
+
+    def _call(self, run: _Run, fn) -> None:
+        try:
+            fn(run.ha)
+        except Exception as e:
+            print(f"❌ Preset error [{run.name}]: {e}")
+            if self._runs.get(run.name) is run:
+                self._runs.pop(run.name)
+                self._end(run)
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            try:
+                self.on_change()
+            except Exception:
+                pass
+
+    def _end(self, run: _Run) -> None:
+        run.alive = False
+        run.ha.effect.stop()
+        if run.ha.canvas is not None:
+            run.ha.canvas.clear()
+        self._changed()
+        if run.ha.frames:
+            st = run.ha.frame_stats()
+            print(
+                f"📊 Preset frames [{run.name}]: {st['frames']} frames, "
+                f"{st['calls_per_frame']} calls/frame for "
+                f"{st['entities_per_frame']} entities/frame"
+            )
+
+    def _meter(self, run: _Run, cpu_budget: float, fx: Effect, cost: float) -> None:
+        now = time.monotonic()
+        if now - run.cpu_window >= BUDGET_WINDOW:
+            run.cpu_window = now
+            run.cpu_spent = 0.0
+        run.cpu_spent += cost
+        if run.cpu_spent > cpu_budget * BUDGET_WINDOW:
+            print(f"⏱ Preset over CPU budget [{run.name}]: stopped")
+            self.stop(run.name)
+            return
+        if not run.alive:
+            return
+        check = getattr(run.module, "is_running", None)
+        try:
+            alive = check(run.ha) if check is not None else fx.pending()
+        except Exception:
+            alive = fx.pending()
+        if not alive and self._runs.get(run.name) is run:
+            # finished on its own (one-shot, or the effect ended itself)
+            self._runs.pop(run.name)
+            self._end(run)
@@ -0,0 +1,92 @@
+"""Preset discovery, preloading and mtime-based hot reload.
+
+`presets/<name>.py` files are discovered once (`scan`) and imported up
+front (`preload`) so the first press costs the same as every later one.
+`get(name)` then only stats the file: an unchanged mtime returns the cached
+module, a changed one re-imports it. Before re-importing, `on_reload(name)`
+lets the host stop running instances; the new code is loaded into a fresh
+module object, so a stopped run's cleanup still executes the code it was
+started with.
+
+The manage GUI uses `names()` from the same registry, without importing.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PRESETS_DIR = PROJECT_ROOT / "presets"
+
+PACKAGE = "presets"
+
+
+class PresetRegistry:
+    def __init__(
+        self,
+        presets_dir: Path = PRESETS_DIR,
+        on_reload: Callable[[str], None] | None = None,
+    ):
+        self.presets_dir = Path(presets_dir)
+        self.on_reload = on_reload
+        self._names: list[str] | None = None
+        self._modules: dict[str, tuple[float, ModuleType]] = {}
+
+    # ---- discovery -----------------------------------------------------
+
+    def scan(self) -> list[str]:
+        if not self.presets_dir.is_dir():
+            self._names = []
+        else:
+            self._names = sorted(
+                p.stem
+                for p in self.presets_dir.glob("*.py")
+                if p.stem != "__init__"
+            )
+        return list(self._names)
+
+    def names(self) -> list[str]:
+        if self._names is None:
+            return self.scan()
+        return list(self._names)
+
+    def path(self, name: str) -> Path:
+        return self.presets_dir / f"{name}.py"
+
+    # ---- loading -------------------------------------------------------
+
+    def preload(self) -> None:
+        for name in self.scan():
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"❌ Preset error [{name}]: {e}")
+
+    def get(self, name: str) -> ModuleType:
+        """Return the preset module, re-importing it only if its mtime moved."""
+        path = self.path(name)
+        mtime = path.stat().st_mtime  # FileNotFoundError for unknown presets
+        cached = self._modules.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        if cached is not None:
+            if self.on_reload is not None:
+                self.on_reload(name)
+            print(f"🔄 Preset reloaded [{name}]")
+        module = self._import(name, path)
+        self._modules[name] = (mtime, module)
+        if self._names is not None and name not in self._names:
+            self._names = sorted(self._names + [name])
+        return module
+
+    def _import(self, name: str, path: Path) -> ModuleType:
+        qualname = f"{PACKAGE}.{name}"
+        spec = importlib.util.spec_from_file_location(qualname, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[qualname] = module
+        return module
@@ -1,29 +1,191 @@
-"""Façade handed to preset modules' `run(ha)` entry point.
+"""Façade handed to preset modules' `start(ha)` / `run(ha)` entry points.
 
 Presets talk only to this object — never to HAClient or the state cache
 directly. Turning a light on/off optimistically updates the local cache
 (for instant LED feedback) and fires the Home Assistant service call.
+
+Each preset run gets its own PresetHA from the PresetHost: `effect` is the
+run's scheduler Effect (schedule timed steps there instead of sleeping), and
+service calls are counted against the preset's call budget — calls over
+budget in the current one-second window are dropped, not queued.
+
+`apply(frame)` pushes one effect step to HA with as few requests as
+possible: one grouped `light.turn_on`/`turn_off` per target state (with
+HA's `transition` doing the fade), or a single `scene.apply` when the step
+mixes domains. Frames are counted so `frame_stats()` can show the calls
+actually paid per frame against the entities each frame moved.
+
+`pace(delay)` and `fanout(n)` adapt an effect to HA's observed throughput
+(see ratecontrol.py); without a rate controller they pass values through.
 """
 
 from __future__ import annotations
 
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
 from .ha_client import HAClient
+from .scheduler import Effect, Scheduler
+
+if TYPE_CHECKING:
+    from .compositor import Canvas
+    from .preset_host import PresetHost
+    from .ratecontrol import RateController
 
 
 class PresetHA:
-    def __init__(self, ha: HAClient):
+    def __init__(
+        self,
+        ha: HAClient,
+        scheduler: Scheduler,
+        name: str = "",
+        effect: Effect | None = None,
+        host: "PresetHost | None" = None,
+        call_budget: int | None = None,
+        rate: "RateController | None" = None,
+        canvas: "Canvas | None" = None,
+    ):
         self._ha = ha
+        self.scheduler = scheduler
+        self.name = name
+        self.effect = effect
+        self._host = host
+        self._rate = rate
+        # pad overlay for the Launchpad itself: canvas.set(row, col, color)
+        self.canvas = canvas
+        self.call_budget = call_budget
+        self.calls = 0
+        self.dropped = 0
+        self._window = 0.0
+        self._window_calls = 0
+        self.frames = 0
+        self.frame_calls = 0
+        self.frame_entities = 0
 
     def all_lights(self) -> list[str]:
-        return [e for e in self._ha.states if e.startswith("light.")]
+        return self._ha.states.domain("light")
+
+    def entities(self, domain: str) -> list[str]:
+        return self._ha.states.domain(domain)
+
+    def area_entities(self, area_id: str, domain: str | None = "light") -> list[str]:
+        """Entities HA places in `area_id` (lights by default)."""
+        return self._ha.states.area(area_id, domain)
 
     def is_on(self, entity_id: str) -> bool:
         return self._ha.state(entity_id) == "on"
 
     def turn_on(self, entity_id: str, **data) -> None:
+        if not self._spend():
+            return
         self._ha.set_local(entity_id, "on")
         self._ha.call("light", "turn_on", {"entity_id": entity_id, **data})
 
     def turn_off(self, entity_id: str) -> None:
+        if not self._spend():
+            return
         self._ha.set_local(entity_id, "off")
         self._ha.call("light", "turn_off", {"entity_id": entity_id})
+
+    # ---- pacing --------------------------------------------------------
+
+    def pace(self, delay: float) -> float:
+        """Stretch an effect delay to what HA is currently absorbing."""
+        return self._rate.pace(delay) if self._rate else delay
+
+    def fanout(self, n: int) -> int:
+        """How many of `n` entities an effect step should drive right now."""
+        return self._rate.fanout(n) if self._rate else n
+
+    # ---- frames --------------------------------------------------------
+
+    def turn_on_many(self, entity_ids: list[str], transition: float | None = None,
+                     **data) -> None:
+        self.apply({e: True for e in entity_ids}, transition, **data)
+
+    def turn_off_many(self, entity_ids: list[str],
+                      transition: float | None = None) -> None:
+        self.apply({e: False for e in entity_ids}, transition)
+
+    def apply(self, frame: dict[str, bool], transition: float | None = None,
+              **data) -> None:
+        """Push one effect step (entity -> on?) in as few HA calls as possible.
+
+        `data` (e.g. brightness) goes to entities turned on; `transition`
+        applies to lights only.
+        """
+        groups: dict[tuple[str, bool], list[str]] = {}
+        for entity_id, on in frame.items():
+            groups.setdefault((entity_id.split(".")[0], bool(on)), []).append(entity_id)
+
+        with self.frame(len(frame)):
+            if len(groups) <= 2 and len({d for d, _ in groups}) == 1:
+                for (domain, on), ids in groups.items():
+                    payload = {"entity_id": ids, **(data if on else {})}
+                    if transition is not None and domain == "light":
+                        payload["transition"] = transition
+                    self._push({e: on for e in ids}, domain,
+                               "turn_on" if on else "turn_off", payload)
+            elif groups:
+                entities = {
+                    e: {"state": "on", **data} if on else {"state": "off"}
+                    for e, on in frame.items()
+                }
+                payload = {"entities": entities}
+                if transition is not None:
+                    payload["transition"] = transition
+                self._push(frame, "scene", "apply", payload)
+
+    def _push(self, frame: dict[str, bool], domain: str, svc: str,
+              payload: dict) -> None:
+        if not self._spend():
+            return
+        for e, on in frame.items():
+            self._ha.set_local(e, "on" if on else "off")
+        self._ha.call(domain, svc, payload)
+
+    @contextmanager
+    def frame(self, entities: int = 0):
+        """Count the HA calls made inside the block as one effect frame."""
+        before = self.calls
+        try:
+            yield
+        finally:
+            self.frames += 1
+            self.frame_calls += self.calls - before
+            self.frame_entities += entities
+
+    def frame_stats(self) -> dict:
+        n = self.frames or 1
+        return {
+            "frames": self.frames,
+            "calls_per_frame": round(self.frame_calls / n, 2),
+            "entities_per_frame": round(self.frame_entities / n, 2),
+        }
+
+    # ---- other presets -------------------------------------------------
+
+    def running_presets(self) -> list[str]:
+        return self._host.running() if self._host else []
+
+    def stop_preset(self, name: str) -> None:
+        if self._host:
+            self._host.stop(name)
+
+    # ---- call budget ---------------------------------------------------
+
+    def _spend(self) -> bool:
+        if self.call_budget is None:
+            self.calls += 1
+            return True
+        now = time.monotonic()
+        if now - self._window >= 1.0:
+            self._window = now
+            self._window_calls = 0
+        if self._window_calls >= self.call_budget:
+            self.dropped += 1
+            return False
+        self._window_calls += 1
+        self.calls += 1
+        return True
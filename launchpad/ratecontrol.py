@@ -0,0 +1,98 @@
+"""Adaptive (AIMD) pacing of preset effects from observed HA latency.
+
+HAClient reports every service call's latency and outcome here. Every
+ADJUST_INTERVAL seconds the window is judged: a mean latency over
+TARGET_LATENCY, an error rate over MAX_ERROR_RATE, or more than
+MAX_IN_FLIGHT requests outstanding halves `scale` (multiplicative
+decrease); a healthy window adds SCALE_STEP back (additive increase), up
+to 1.0. Effects read it through PresetHA: `pace(delay)` stretches their
+frame delays by 1/scale and `fanout(n)` trims how many entities a step
+drives, so the load they put on HA tracks what HA actually absorbs.
+
+`status()` reports the current scale and the effective (completed) call
+rate; changes of regime are printed.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+
+from .ha_client import HAClient
+
+ADJUST_INTERVAL = 0.5  # seconds per AIMD decision
+TARGET_LATENCY = 0.3  # mean seconds per call considered healthy
+MAX_ERROR_RATE = 0.1
+MAX_IN_FLIGHT = 16
+
+SCALE_STEP = 0.05  # additive increase per healthy window
+MIN_SCALE = 0.05  # effects never slow below 1/20 of their design rate
+
+
+class RateController:
+    def __init__(self, ha: HAClient):
+        self.ha = ha
+        self.scale = 1.0
+        self.effective_rate = 0.0  # completed calls/s over the last window
+        self.latency = 0.0  # mean seconds over the last window
+        self.error_rate = 0.0
+        self._lock = threading.Lock()
+        self._n = 0
+        self._errors = 0
+        self._lat_sum = 0.0
+        ha.on_call_done = self.observe
+
+    def observe(self, latency: float, ok: bool) -> None:
+        """Record one finished call (any thread)."""
+        with self._lock:
+            self._n += 1
+            self._lat_sum += latency
+            if not ok:
+                self._errors += 1
+
+    def adjust(self) -> None:
+        with self._lock:
+            n, errors, lat_sum = self._n, self._errors, self._lat_sum
+            self._n = self._errors = 0
+            self._lat_sum = 0.0
+        self.effective_rate = n / ADJUST_INTERVAL
+        self.latency = lat_sum / n if n else 0.0
+        self.error_rate = errors / n if n else 0.0
+
+        congested = (
+            self.ha.in_flight > MAX_IN_FLIGHT
+            or (n and (self.latency > TARGET_LATENCY
+                       or self.error_rate > MAX_ERROR_RATE))
+        )
+        old = self.scale
+        if congested:
+            self.scale = max(MIN_SCALE, self.scale * 0.5)
+        elif n or self.ha.in_flight == 0:
+            self.scale = min(1.0, self.scale + SCALE_STEP)
+
+        if self.scale < old:
+            print(
+                f"🐢 HA slow ({self.latency * 1000:.0f} ms, "
+                f"{self.error_rate:.0%} errors, {self.ha.in_flight} in flight): "
+                f"effects at {self.scale:.0%}, {self.effective_rate:.1f} calls/s"
+            )
+        elif self.scale == 1.0 and old < 1.0:
+            print(f"🐇 HA keeping up: effects at full rate "
+                  f"({self.effective_rate:.1f} calls/s)")
+
+    # ---- effect side ---------------------------------------------------
+
+    def pace(self, delay: float) -> float:
+        return delay / self.scale
+
+    def fanout(self, n: int) -> int:
+        return max(1, math.ceil(n * self.scale)) if n else 0
+
+    def status(self) -> dict:
+        return {
+            "scale": round(self.scale, 3),
+            "effective_rate": round(self.effective_rate, 2),
+            "latency_ms": round(self.latency * 1000, 1),
+            "error_rate": round(self.error_rate, 3),
+            "in_flight": self.ha.in_flight,
+        }
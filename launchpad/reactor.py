@@ -0,0 +1,193 @@
+"""Optional single-reactor asyncio runtime for the daemon.
+
+The threaded runtime (`Controller.run`) polls MIDI every 10 ms, HAClient
+spawns a thread per service call and the WebSocket lives on its own thread.
+`AsyncController` runs the same Controller logic on one asyncio event loop:
+
+- MIDI input arrives through each surface's input callback and is hopped
+  onto the loop with `call_soon_threadsafe`; port discovery, open and the
+  hot-plug presence checks (blocking mido calls) run in the executor.
+- HA service calls, the REST state fetch and the WebSocket subscription run
+  in the executor; every state update is *applied* on the loop.
+- Pad repaints are coalesced into one loop timer instead of being dropped
+  inside the rate-limit window, and preset steps run from the shared
+  scheduler heap driven by the loop (`Scheduler.drive`).
+
+Blocking libraries only ever touch `IOExecutor`, a fixed pool of daemon
+threads (plus the control socket's listener thread), so the thread count
+is constant no matter how many lights or presses are in flight. Handlers
+run one at a time on the loop, in arrival order, which keeps scheduling
+deterministic.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import Executor, Future
+from functools import partial
+
+from .app import PAD_REFRESH_INTERVAL, SHUTDOWN_GRACE, Controller
+from .config import Config
+from .ha_client import HAClient
+from .surface import Surface
+
+# executor size: the WS loop holds one worker for good, the rest serve HTTP
+# calls and (brief) MIDI port probes
+IO_WORKERS = 6
+
+# seconds between hot-plug presence checks
+HOTPLUG_INTERVAL = 1.0
+
+
+class IOExecutor(Executor):
+    """Fixed pool of daemon worker threads for blocking library calls.
+
+    ThreadPoolExecutor joins its non-daemon workers at interpreter exit,
+    which would hang shutdown behind the never-ending WS loop; these die
+    with the process, like the threaded runtime's helpers.
+    """
+
+    def __init__(self, workers: int = IO_WORKERS):
+        self._jobs: queue.SimpleQueue = queue.SimpleQueue()
+        for i in range(workers):
+            threading.Thread(
+                target=self._work, name=f"lp-io-{i}", daemon=True
+            ).start()
+
+    @property
+    def backlog(self) -> int:
+        return self._jobs.qsize()
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        fut: Future = Future()
+        self._jobs.put((fut, fn, args, kwargs))
+        return fut
+
+    def _work(self) -> None:
+        while True:
+            fut, fn, args, kwargs = self._jobs.get()
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                fut.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                fut.set_exception(e)
+
+
+class AsyncController(Controller):
+    def __init__(self, config: Config, ha: HAClient):
+        super().__init__(config, ha)
+        self.io = IOExecutor()
+        self.ha.executor = self.io
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._repaint: asyncio.TimerHandle | None = None
+
+    # ---- LED painting --------------------------------------------------
+
+    def update_pads(self) -> None:
+        """Schedule one repaint at the end of the rate-limit window.
+
+        Requests arriving while one is pending fold into it, so the last
+        state change is always painted (the threaded runtime drops it).
+        Must be called on the loop.
+        """
+        if self._repaint is not None:
+            return
+        delay = max(0.0, self._last_update + PAD_REFRESH_INTERVAL - self._loop.time())
+        self._repaint = self._loop.call_later(delay, self._repaint_now)
+
+    def _repaint_now(self) -> None:
+        self._repaint = None
+        self._last_update = self._loop.time()
+        start = time.monotonic()
+        self.paint_pads()
+        self._loop_busy(time.monotonic() - start)
+
+    # ---- MIDI bridge ---------------------------------------------------
+
+    def _on_midi(self, surface: Surface, msg) -> None:
+        # runs on the MIDI backend's thread
+        self._loop.call_soon_threadsafe(
+            self._handle_on_loop, surface, msg, time.monotonic())
+
+    def _handle_on_loop(self, surface: Surface, msg, t0: float) -> None:
+        # the loop has no iteration of its own: each callback the daemon
+        # runs on it counts as one for the loop metrics
+        start = time.monotonic()
+        self._handle_message(surface, msg, t0)
+        self._loop_busy(time.monotonic() - start)
+
+    async def _open_midi(self, surface: Surface) -> bool:
+        opened = await self._loop.run_in_executor(
+            self.io, surface.midi.try_open, partial(self._on_midi, surface)
+        )
+        if opened:
+            surface.connected = True
+            surface.connects += 1
+            surface.compositor.invalidate()
+            self.update_pads()
+        return opened
+
+    async def _watch_midi(self) -> None:
+        while True:
+            for surface in self.surfaces:
+                if not surface.connected:
+                    await self._open_midi(surface)
+                    continue
+                present = await self._loop.run_in_executor(
+                    self.io, surface.midi.still_present
+                )
+                if not present:
+                    self._disconnect(surface)
+            await asyncio.sleep(HOTPLUG_INTERVAL)
+
+    # ---- main loop -----------------------------------------------------
+
+    async def _main(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            self._loop.add_signal_handler(sig, stop.set)
+        self._loop.add_signal_handler(signal.SIGUSR1, self.latency.print_report)
+
+        self.presets.registry.preload()
+        self.control.start()
+        for surface in self.surfaces:
+            if not await self._open_midi(surface):
+                print(f"⏳ Waiting for Launchpad: {surface.name}")
+        await self._loop.run_in_executor(
+            self.io, partial(self.ha.refresh_states, force=True)
+        )
+        self.ha.start_ws(self.update_pads, deliver=self._loop.call_soon_threadsafe)
+
+        print("🚀 FAST Controller Started (asyncio)")
+        self.update_pads()
+
+        tasks = [
+            self._loop.create_task(self._watch_midi()),
+            self._loop.create_task(self.scheduler.drive(self._loop_busy)),
+        ]
+        await stop.wait()
+        print("🛑 Shutting down...")
+        deadline = self._loop.time() + SHUTDOWN_GRACE
+        self.presets.stop_all()
+        # cleanups run from the scheduler, which this loop drives: let it
+        # get through them, then give their HA calls time to land
+        done = self._loop.create_future()
+        self.scheduler.call_soon(done.set_result, None)
+        try:
+            await asyncio.wait_for(done, SHUTDOWN_GRACE)
+        except asyncio.TimeoutError:
+            pass
+        await self._loop.run_in_executor(
+            None, self.ha.wait_idle, max(0.0, deadline - self._loop.time()))
+        for task in tasks:
+            task.cancel()
+        self.close()
+
+    def run(self) -> None:
+        asyncio.run(self._main())
@@ -0,0 +1,253 @@
+"""Shared timer-heap scheduler for preset effects.
+
+Every timed step of every running effect sits on one heap ordered by due
+time, so 80 chaos lights cost 80 heap entries rather than 80 sleeping
+threads. Steps run one at a time on a single driver: a dedicated thread in
+the threaded runtime (`start_thread`), or the asyncio loop in the reactor
+runtime (`drive`).
+
+Presets work with named `Effect`s: `start(name)` returns one, its
+`call_later`/`every` schedule steps, and `stop(name)` cancels all of them
+before returning, so no step of a stopped effect ever runs afterwards and
+no settling sleep is needed. Cancelled timers stay in the heap and are
+discarded when they reach the top. Each effect step is metered in thread
+CPU time (`Effect.cpu_time`, `Effect.on_step`) so a host can budget it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable
+
+
+class TimerHandle:
+    """A scheduled call. `cancel()` is immediate and idempotent."""
+
+    __slots__ = ("when", "seq", "interval", "fn", "args", "cancelled", "effect")
+
+    def __init__(self, when: float, seq: int, fn: Callable, args: tuple,
+                 interval: float | None = None, effect: "Effect | None" = None):
+        self.when = when
+        self.seq = seq
+        self.interval = interval
+        self.fn = fn
+        self.args = args
+        self.cancelled = False
+        self.effect = effect
+
+    def __lt__(self, other: "TimerHandle") -> bool:
+        return (self.when, self.seq) < (other.when, other.seq)
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        if self.effect is not None:
+            self.effect._forget(self)
+
+
+class Effect:
+    """A named group of timers that start and stop together."""
+
+    def __init__(self, scheduler: "Scheduler", name: str):
+        self.name = name
+        self._scheduler = scheduler
+        self._timers: set[TimerHandle] = set()
+        self._lock = threading.Lock()
+        self.running = True
+        self.cpu_time = 0.0
+        # called as on_step(effect, cpu_seconds) after every step
+        self.on_step: Callable[["Effect", float], None] | None = None
+
+    def call_later(self, delay: float, fn: Callable, *args) -> TimerHandle:
+        return self._add(delay, fn, args, None)
+
+    def call_soon(self, fn: Callable, *args) -> TimerHandle:
+        return self._add(0.0, fn, args, None)
+
+    def every(self, interval: float, fn: Callable, *args) -> TimerHandle:
+        """Run `fn` every `interval` seconds, first after one interval."""
+        return self._add(interval, fn, args, interval)
+
+    def pending(self) -> bool:
+        return bool(self._timers)
+
+    def _add(self, delay, fn, args, interval) -> TimerHandle:
+        with self._lock:
+            h = self._scheduler._make(delay, fn, args, interval, self)
+            if not self.running:  # a step racing stop(): never let it run
+                h.cancelled = True
+                return h
+            self._timers.add(h)
+        self._scheduler._push(h)
+        return h
+
+    def _run(self, h: TimerHandle) -> None:
+        t0 = time.thread_time()
+        try:
+            h.fn(*h.args)
+        finally:
+            cost = time.thread_time() - t0
+            self.cpu_time += cost
+            if h.interval is None:
+                self._forget(h)
+            if self.on_step is not None:
+                self.on_step(self, cost)
+
+    def _forget(self, h: TimerHandle) -> None:
+        with self._lock:
+            self._timers.discard(h)
+
+    def stop(self) -> None:
+        effects = self._scheduler._effects
+        if effects.get(self.name) is self:
+            effects.pop(self.name, None)
+        with self._lock:
+            self.running = False
+            timers, self._timers = self._timers, set()
+        for h in timers:
+            h.cancelled = True
+
+
+class Scheduler:
+    def __init__(self):
+        self._heap: list[TimerHandle] = []
+        self._cond = threading.Condition(threading.Lock())
+        self._seq = itertools.count()
+        self._effects: dict[str, Effect] = {}
+        self._waker: Callable[[], None] | None = None
+        self._closed = False
+
+    # ---- timers --------------------------------------------------------
+
+    def _make(self, delay, fn, args, interval=None, effect=None) -> TimerHandle:
+        when = time.monotonic() + max(0.0, delay)
+        return TimerHandle(when, next(self._seq), fn, args, interval, effect)
+
+    def _push(self, h: TimerHandle) -> None:
+        with self._cond:
+            heapq.heappush(self._heap, h)
+            if self._heap[0] is h:
+                self._cond.notify()
+                if self._waker is not None:
+                    self._waker()
+
+    def call_later(self, delay: float, fn: Callable, *args) -> TimerHandle:
+        h = self._make(delay, fn, args)
+        self._push(h)
+        return h
+
+    def call_soon(self, fn: Callable, *args) -> TimerHandle:
+        return self.call_later(0.0, fn, *args)
+
+    def every(self, interval: float, fn: Callable, *args) -> TimerHandle:
+        h = self._make(interval, fn, args, interval)
+        self._push(h)
+        return h
+
+    def queued(self) -> int:
+        """Timers in the heap (cancelled ones linger until they come due)."""
+        return len(self._heap)
+
+    def run_due(self) -> float | None:
+        """Run every due step; return seconds until the next (None = idle)."""
+        while True:
+            with self._cond:
+                if not self._heap:
+                    return None
+                h = self._heap[0]
+                if h.cancelled:
+                    heapq.heappop(self._heap)
+                    continue
+                delay = h.when - time.monotonic()
+                if delay > 0:
+                    return delay
+                heapq.heappop(self._heap)
+            try:
+                if h.effect is not None:
+                    h.effect._run(h)
+                else:
+                    h.fn(*h.args)
+            except Exception as e:
+                print(f"❌ Scheduler step error: {e}")
+            if h.interval is not None and not h.cancelled:
+                h.when += h.interval
+                h.seq = next(self._seq)
+                self._push(h)
+
+    # ---- effects -------------------------------------------------------
+
+    def start(self, name: str) -> Effect:
+        """Start a fresh effect under `name`, stopping any previous one."""
+        self.stop(name)
+        fx = Effect(self, name)
+        self._effects[name] = fx
+        return fx
+
+    def stop(self, name: str) -> bool:
+        """Cancel every pending step of `name`. Returns whether it ran."""
+        fx = self._effects.get(name)
+        if fx is None:
+            return False
+        fx.stop()
+        return True
+
+    def stop_all(self) -> None:
+        for name in list(self._effects):
+            self.stop(name)
+
+    def is_running(self, name: str) -> bool:
+        return name in self._effects
+
+    def running(self) -> list[str]:
+        return list(self._effects)
+
+    # ---- drivers -------------------------------------------------------
+
+    def start_thread(self) -> None:
+        """Drive the heap from one dedicated daemon thread."""
+        threading.Thread(target=self._thread_loop, name="lp-scheduler",
+                         daemon=True).start()
+
+    def _thread_loop(self) -> None:
+        while not self._closed:
+            self.run_due()
+            with self._cond:
+                if self._closed:
+                    return
+                # recompute under the lock so a push can't slip in unseen
+                delay = None
+                while self._heap and self._heap[0].cancelled:
+                    heapq.heappop(self._heap)
+                if self._heap:
+                    delay = max(0.0, self._heap[0].when - time.monotonic())
+                self._cond.wait(timeout=delay)
+
+    async def drive(self, on_pass: Callable[[float], None] | None = None) -> None:
+        """Drive the heap from the running asyncio loop until cancelled.
+
+        `on_pass` hears how many seconds each pass over due timers took.
+        """
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        self._waker = lambda: loop.call_soon_threadsafe(wake.set)
+        try:
+            while True:
+                wake.clear()
+                start = time.monotonic()
+                delay = self.run_due()
+                if on_pass is not None:
+                    on_pass(time.monotonic() - start)
+                try:
+                    await asyncio.wait_for(wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._waker = None
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
@@ -5,38 +5,33 @@ GUI's Connection dialog — no .env required. Resolution order:
 
     settings.json  ->  environment / .env  (back-compat fallback)
 
-The file holds a long-lived token, so it is written 0600 and should never be
-committed (see .gitignore).
+The file holds a long-lived token, so it is written 0600 (atomically, with a
+0600 last-known-good backup, see storage.py) and should never be committed
+(see .gitignore).
 """
 
 from __future__ import annotations
 
-import json
 import os
 from pathlib import Path
 
 from dotenv import load_dotenv
 
+from .storage import read_json, write_json
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 SETTINGS_PATH = PROJECT_ROOT / "settings.json"
 
 
 def load_settings() -> dict:
     try:
-        with open(SETTINGS_PATH) as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        return read_json(SETTINGS_PATH)
+    except (OSError, ValueError):
         return {}
 
 
 def save_settings(data: dict) -> None:
-    with open(SETTINGS_PATH, "w") as f:
-        json.dump(data, f, indent=2)
-        f.write("\n")
-    try:
-        os.chmod(SETTINGS_PATH, 0o600)  # contains a token
-    except OSError:
-        pass
+    write_json(SETTINGS_PATH, data, mode=0o600)  # contains a token
 
 
 def programmer_mode() -> bool:
@@ -53,6 +48,66 @@ def programmer_mode() -> bool:
     return bool(load_settings().get("launchpad_programmer_mode", True))
 
 
+def runtime() -> str:
+    """Which daemon runtime to use: "threads" (default) or "asyncio".
+
+    "asyncio" runs MIDI input, the HA WebSocket, service calls and repaint
+    timers on one event loop (see launchpad/reactor.py). Set via
+    "launchpad_runtime" in settings.json.
+    """
+    value = str(load_settings().get("launchpad_runtime", "threads")).lower()
+    return value if value in ("threads", "asyncio") else "threads"
+
+
+def led_frame_rate() -> int:
+    """Pad frames per second pushed by the compositor ("launchpad_fps")."""
+    try:
+        return max(1, int(load_settings().get("launchpad_fps", 25)))
+    except (TypeError, ValueError):
+        return 25
+
+
+def usb_message_budget() -> int:
+    """Max LED messages per second sent to the device ("launchpad_usb_budget")."""
+    try:
+        return max(1, int(load_settings().get("launchpad_usb_budget", 1000)))
+    except (TypeError, ValueError):
+        return 1000
+
+
+def sysex_frames() -> bool:
+    """Push each LED frame as one SysEx ("launchpad_sysex_frames").
+
+    Off by default: SysEx addresses LEDs by Programmer-layout number, so
+    only enable it when the device runs the Programmer layout.
+    """
+    return bool(load_settings().get("launchpad_sysex_frames", False))
+
+
+def color_mirror() -> str:
+    """How lit pads mirror a light's HA `rgb_color` ("launchpad_color_mirror").
+
+    "off" (default) keeps the configured on_color; "palette" shows the
+    nearest palette color; "sysex" sends the exact RGB (Programmer layout).
+    """
+    value = str(load_settings().get("launchpad_color_mirror", "off")).lower()
+    return value if value in ("off", "palette", "sysex") else "off"
+
+
+def metrics_file() -> Path | None:
+    """Where to keep a Prometheus text file ("launchpad_metrics_file").
+
+    Unset (default) writes nothing; the metrics are still served on the
+    control socket. Relative paths are taken from the project directory,
+    e.g. a node_exporter textfile-collector directory symlinked there.
+    """
+    value = load_settings().get("launchpad_metrics_file")
+    if not value:
+        return None
+    path = Path(str(value)).expanduser()
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
 def get_credentials() -> tuple[str | None, str | None]:
     """Return (url, token), preferring settings.json, then .env/environment."""
     s = load_settings()
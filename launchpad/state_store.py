@@ -0,0 +1,176 @@
+"""Entity state cache with incremental domain and area indexes.
+
+`StateStore` is the mapping behind `HAClient.states` (entity_id -> HA state
+dict). Alongside the states it keeps per-domain and per-area entity sets,
+updated on every insert/delete, so queries such as "all lights" cost
+O(result) instead of a scan over every entity on large installs. Sets are
+insertion-ordered dicts, so results come back in the same order a scan of
+the store would give.
+
+Optimistic writes (`set_pending`) are flagged as pending until the next
+real update for that entity arrives or their deadline passes, so the pads
+can show "waiting for Home Assistant" distinctly from a confirmed state.
+
+`on_change(entity_id)` (if set) hears about every write, with None for a
+full snapshot, so derived views can update incrementally. Every write also
+bumps a change sequence; `changed_since(seq)` lets a remote viewer (the
+manage GUI, over the control socket) fetch only what changed since its
+last look.
+
+Areas are not part of HA state objects; HAClient fills them from the
+entity/device registries (`set_areas`) when its WebSocket connects.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator, MutableMapping
+from typing import Callable
+
+# entity states that count as "lit" for LED purposes
+ON_STATES = ("on", "cool")
+
+# entity states shown with an action's "unavailable" look
+UNAVAILABLE_STATES = ("unavailable",)
+
+
+def _domain(entity_id: str) -> str:
+    return entity_id.split(".", 1)[0]
+
+
+class StateStore(MutableMapping):
+    def __init__(self, states: dict[str, dict] | None = None):
+        self._states: dict[str, dict] = {}
+        self._by_domain: dict[str, dict[str, None]] = {}
+        self._area_of: dict[str, str] = {}
+        self._by_area: dict[str, dict[str, None]] = {}
+        self._pending: dict[str, float] = {}  # entity_id -> monotonic deadline
+        self.on_change: Callable[[str | None], None] | None = None
+        self._seq_lock = threading.Lock()
+        self._seq = 0
+        self._version: dict[str, int] = {}  # entity_id -> seq of last write
+        self._reset_seq = 0  # seq of the last full snapshot
+        if states:
+            self.replace(states)
+
+    # ---- mapping -------------------------------------------------------
+
+    def __getitem__(self, entity_id: str) -> dict:
+        return self._states[entity_id]
+
+    def __setitem__(self, entity_id: str, state: dict) -> None:
+        self._put(entity_id, state)
+        self._pending.pop(entity_id, None)
+        self._changed(entity_id)
+
+    def __delitem__(self, entity_id: str) -> None:
+        del self._states[entity_id]
+        self._pending.pop(entity_id, None)
+        members = self._by_domain.get(_domain(entity_id))
+        if members is not None:
+            members.pop(entity_id, None)
+        area_id = self._area_of.pop(entity_id, None)
+        if area_id is not None:
+            members = self._by_area.get(area_id)
+            if members is not None:
+                members.pop(entity_id, None)
+                if not members:
+                    del self._by_area[area_id]
+        self._changed(entity_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._states)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, entity_id: object) -> bool:
+        return entity_id in self._states
+
+    def get(self, entity_id: str, default=None):
+        return self._states.get(entity_id, default)
+
+    def replace(self, states: dict[str, dict]) -> None:
+        """Swap in a full snapshot (REST refresh), rebuilding the indexes."""
+        by_domain: dict[str, dict[str, None]] = {}
+        for entity_id in states:
+            by_domain.setdefault(_domain(entity_id), {})[entity_id] = None
+        self._states = dict(states)
+        self._by_domain = by_domain
+        self._pending.clear()
+        self._changed(None)
+
+    def _put(self, entity_id: str, state: dict) -> None:
+        if entity_id not in self._states:
+            self._by_domain.setdefault(_domain(entity_id), {})[entity_id] = None
+        self._states[entity_id] = state
+
+    def _changed(self, entity_id: str | None) -> None:
+        with self._seq_lock:
+            self._seq += 1
+            if entity_id is None:
+                self._reset_seq = self._seq
+                self._version.clear()
+            else:
+                self._version[entity_id] = self._seq
+        if self.on_change is not None:
+            self.on_change(entity_id)
+
+    # ---- optimistic writes ---------------------------------------------
+
+    def set_pending(self, entity_id: str, state: dict, timeout: float) -> None:
+        """Store an unconfirmed state; pending for at most `timeout` seconds."""
+        self._put(entity_id, state)
+        self._pending[entity_id] = time.monotonic() + timeout
+        self._changed(entity_id)
+
+    def is_pending(self, entity_id: str) -> bool:
+        deadline = self._pending.get(entity_id)
+        if deadline is None:
+            return False
+        if time.monotonic() >= deadline:
+            self._pending.pop(entity_id, None)
+            return False
+        return True
+
+    # ---- change feed ---------------------------------------------------
+
+    def changed_since(self, seq: int) -> tuple[int, list[str] | None]:
+        """(current seq, entities written after `seq`); None means all.
+
+        A cursor from before the last full snapshot (or 0) gets None: the
+        caller should take everything.
+        """
+        with self._seq_lock:
+            if seq <= 0 or seq < self._reset_seq:
+                return self._seq, None
+            return self._seq, [e for e, v in self._version.items() if v > seq]
+
+    # ---- indexed queries -----------------------------------------------
+
+    def domain(self, domain: str) -> list[str]:
+        return list(self._by_domain.get(domain, ()))
+
+    def domains(self) -> list[str]:
+        return [d for d, members in self._by_domain.items() if members]
+
+    def area(self, area_id: str, domain: str | None = None) -> list[str]:
+        members = self._by_area.get(area_id, ())
+        if domain is None:
+            return list(members)
+        return [e for e in members if _domain(e) == domain]
+
+    def area_of(self, entity_id: str) -> str | None:
+        return self._area_of.get(entity_id)
+
+    def areas(self) -> list[str]:
+        return list(self._by_area)
+
+    def set_areas(self, area_of: dict[str, str]) -> None:
+        """Replace the entity -> area_id map (from HA's registries)."""
+        by_area: dict[str, dict[str, None]] = {}
+        for entity_id, area_id in area_of.items():
+            by_area.setdefault(area_id, {})[entity_id] = None
+        self._area_of = dict(area_of)
+        self._by_area = by_area
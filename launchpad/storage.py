@@ -0,0 +1,116 @@
+"""Crash-safe JSON files: atomic replace plus a last-known-good backup.
+
+`write_json` never leaves a half-written target: it writes a temp file in
+the same directory, fsyncs it, and renames it over the target (atomic on
+POSIX), then fsyncs the directory so the rename itself survives power
+loss. Before replacing, the current file — if it still parses — is copied
+to `<name>.bak` the same way, so there is always one good previous version.
+Replacements keep the target's permissions (new files get the umask
+default) unless a `mode` is given.
+
+`read_json` falls back to that backup when the file is truncated, corrupt
+or rejected by `parse`, instead of letting callers replace it with a
+default. A missing file is not corruption and raises FileNotFoundError.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# permissions open() would give a new file (mkstemp always uses 0600)
+DEFAULT_MODE = 0o666 & ~_umask()
+
+
+def backup_path(path: Path) -> Path:
+    return path.with_name(path.name + ".bak")
+
+
+def _mode_of(path: Path) -> int:
+    try:
+        return path.stat().st_mode & 0o7777
+    except OSError:
+        return DEFAULT_MODE
+
+
+def _write_atomic(path: Path, payload: bytes, mode: int | None,
+                  durable: bool = True) -> None:
+    if mode is None:
+        mode = _mode_of(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        os.fchmod(fd, mode)  # before any data lands, e.g. 0600 for tokens
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    if not durable:
+        return
+    try:
+        dfd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dfd)
+        finally:
+            os.close(dfd)
+    except OSError:
+        pass
+
+
+def write_json(path: str | Path, data: Any, mode: int | None = None) -> None:
+    """Atomically replace `path` with `data` as indented JSON."""
+    path = Path(path)
+    try:
+        current = path.read_bytes()
+        json.loads(current)
+    except (OSError, ValueError):
+        current = None  # nothing good to keep
+    if current:
+        bak_mode = mode if mode is not None else _mode_of(path)
+        _write_atomic(backup_path(path), current, bak_mode)
+    _write_atomic(path, (json.dumps(data, indent=2) + "\n").encode(), mode)
+
+
+def write_text(path: str | Path, text: str, mode: int | None = None,
+               durable: bool = True) -> None:
+    """Atomically replace `path` with `text` (no backup kept).
+
+    `durable=False` skips the fsyncs: readers still never see a partial
+    file, but a power cut may lose the write — fine for files that are
+    rewritten every few seconds anyway.
+    """
+    _write_atomic(Path(path), text.encode(), mode, durable)
+
+
+def read_json(path: str | Path, parse: Callable[[Any], Any] = lambda d: d) -> Any:
+    """Load `path` through `parse`, or its backup when the file is damaged."""
+    path = Path(path)
+    with open(path, "rb") as f:  # FileNotFoundError propagates
+        raw = f.read()
+    try:
+        return parse(json.loads(raw))
+    except Exception as e:
+        bak = backup_path(path)
+        try:
+            data = parse(json.loads(bak.read_bytes()))
+        except Exception:
+            raise e from None
+        print(f"🩹 {path.name} is damaged ({e}); using {bak.name}")
+        return data
@@ -0,0 +1,84 @@
+"""One attached Launchpad: its MIDI port, LED compositor and room binding.
+
+The daemon drives one Surface per entry in config.json's `devices` (or a
+single Surface serving every room when none are listed). Surfaces keep
+their own active room and frame state; Home Assistant, the state store,
+the scheduler and the preset host are shared by all of them.
+"""
+
+from __future__ import annotations
+
+from .compositor import FrameCompositor
+from .config import Config, Device, Room
+from .midi import MidiSurface
+from .scheduler import Scheduler
+
+# the implicit device when config.json lists none: first Launchpad, all rooms
+DEFAULT_DEVICE = Device(name="launchpad")
+
+
+class Surface:
+    def __init__(
+        self,
+        device: Device,
+        midi: MidiSurface,
+        rooms: list[Room],
+        scheduler: Scheduler,
+        fps: int,
+        budget: int,
+    ):
+        self.device = device
+        self.name = device.name
+        self.midi = midi
+        self.rooms = rooms
+        self.active_room: Room = rooms[0]
+        self.page = 0
+        self.compositor = FrameCompositor(midi, scheduler, fps=fps, budget=budget)
+        self.connected = False
+        self.next_attempt = 0.0  # monotonic time of the next hot-plug retry
+        self.connects = 0  # successful (re)opens of the port
+
+    def __repr__(self) -> str:
+        return f"Surface({self.name!r}, port={self.midi.port!r})"
+
+    def bind(self, rooms: list[Room]) -> None:
+        """Serve a new room list, staying on the same room (by name) and page."""
+        current = self.active_room.name
+        self.rooms = rooms
+        self.active_room = next((r for r in rooms if r.name == current), rooms[0])
+        if self.active_room.name != current:
+            self.page = 0
+        self.page = min(self.page, self.active_room.pages - 1)
+
+
+def rooms_for(config: Config, dev: Device) -> list[Room]:
+    if dev.rooms is None:
+        return config.rooms
+    return [r for r in config.rooms if r.name in dev.rooms]
+
+
+def build_surfaces(
+    config: Config,
+    scheduler: Scheduler,
+    fps: int,
+    budget: int,
+    sysex_frames: bool = False,
+) -> list[Surface]:
+    """One Surface per configured device; a single catch-all without any."""
+    devices = config.devices or [DEFAULT_DEVICE]
+    surfaces = []
+    for dev in devices:
+        rooms = rooms_for(config, dev)
+        if not rooms:
+            print(f"❌ Device [{dev.name}] serves no known room: skipped")
+            continue
+        surfaces.append(
+            Surface(dev, MidiSurface(dev.port, sysex_frames), rooms,
+                    scheduler, fps, budget)
+        )
+    if not surfaces:  # every binding was bad: fall back to one surface
+        surfaces.append(
+            Surface(DEFAULT_DEVICE, MidiSurface(sysex_frames=sysex_frames),
+                    config.rooms, scheduler, fps, budget)
+        )
+    return surfaces
@@ -1,6 +1,9 @@
 # presets/all_toggle.py
+#
+# One-shot preset: only start() is declared, so the host treats every press
+# as a fresh run.
 
-def run(ha):
+def start(ha):
     lights = ha.all_lights()
     if not lights:
         return
@@ -12,17 +15,13 @@ def run(ha):
 
     if any_off:
         print("💡 ALL ON")
-        for light in lights:
-            ha.turn_on(light)
+        ha.turn_on_many(lights)  # one grouped call, not one per light
     else:
         print("💤 ALL OFF")
 
-        # stop effects safely
-        for name in ("chaos", "wave"):
-            try:
-                __import__(f"presets.{name}").stop()
-            except Exception:
-                pass
+        # stop running effects first so none re-lights a pad afterwards
+        for name in ha.running_presets():
+            if name != ha.name:
+                ha.stop_preset(name)
 
-        for light in lights:
-            ha.turn_off(light)
+        ha.turn_off_many(lights)
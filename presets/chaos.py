@@ -1,63 +1,56 @@
-import time
 import random
-import threading
 
-# Global control flag (module-level = persistent)
-_running = False
-_threads = []
+# Every light runs its own random on/off/flash sequence. Steps are timers on
+# this run's scheduler effect (ha.effect), not one sleeping thread per
+# light, so stopping cancels every pending step at once. Idle gaps go
+# through ha.pace() and only ha.fanout() of the lights act per round, so the
+# effect slows down instead of piling requests onto a slow HA.
 
 
-def _light_chaos_worker(ha, entity_id):
-    while _running:
-        time.sleep(random.uniform(0.05, 0.6))
-        mode = random.random()
+def _next(ha, lights, i):
+    ha.effect.call_later(ha.pace(random.uniform(0.05, 0.6)), _step, ha, lights, i)
 
-        if mode < 0.5:
-            ha.turn_on(entity_id)
-            time.sleep(random.uniform(0.05, 0.2))
-            ha.turn_off(entity_id)
 
-        elif mode < 0.8:
-            ha.turn_on(entity_id, flash="short")
+def _off_then_next(ha, lights, i):
+    ha.turn_off(lights[i])
+    _next(ha, lights, i)
 
-        else:
-            ha.turn_on(entity_id)
-            time.sleep(random.uniform(0.2, 0.8))
-            ha.turn_off(entity_id)
 
+def _step(ha, lights, i):
+    if i >= ha.fanout(len(lights)):
+        _next(ha, lights, i)  # sitting this round out
+        return
 
-def stop(ha):
-    global _running
-    _running = False
+    entity_id = lights[i]
+    mode = random.random()
 
-    # give threads time to exit
-    time.sleep(0.2)
+    if mode < 0.5:
+        ha.turn_on(entity_id)
+        ha.effect.call_later(random.uniform(0.05, 0.2), _off_then_next, ha, lights, i)
 
-    for light in ha.all_lights():
-        ha.turn_off(light)
+    elif mode < 0.8:
+        ha.turn_on(entity_id, flash="short")
+        _next(ha, lights, i)
 
-    print("🛑 Chaos stopped")
+    else:
+        ha.turn_on(entity_id)
+        ha.effect.call_later(random.uniform(0.2, 0.8), _off_then_next, ha, lights, i)
 
 
-def run(ha):
-    global _running, _threads
+def start(ha):
+    lights = ha.all_lights()
+    random.shuffle(lights)  # so fan-out trimming doesn't always idle the same end
+    print(f"💣 CHAOS MODE STARTED ({len(lights)} lights)")
 
-    # Toggle behavior
-    if _running:
-        stop(ha)
-        return
+    for i in range(len(lights)):
+        _next(ha, lights, i)
 
-    _running = True
-    _threads = []
 
-    lights = ha.all_lights()
-    print(f"💣 CHAOS MODE STARTED ({len(lights)} lights)")
+def stop(ha):
+    ha.turn_off_many(ha.all_lights())
+
+    print("🛑 Chaos stopped")
+
 
-    for entity_id in lights:
-        t = threading.Thread(
-            target=_light_chaos_worker,
-            args=(ha, entity_id),
-            daemon=True
-        )
-        t.start()
-        _threads.append(t)
+def is_running(ha):
+    return ha.effect.running
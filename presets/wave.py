@@ -1,61 +1,47 @@
-import time
-import threading
+import math
 
 # timing (seconds)
 WAVE_DELAY = 0.15
 HOLD_TIME = 0.3
 
-_running = False
-_thread = None
+# most steps per sweep: with more lights than this, neighbours share a step
+# and HA's transition fades them in, so a sweep costs MAX_STEPS requests
+# instead of one per light. A slow HA (ha.fanout) gets fewer, wider steps.
+MAX_STEPS = 8
 
 
-def _wave_loop(ha):
-    lights = ha.all_lights()
-
-    if not lights:
-        return
+def _bands(ha, lights):
+    steps = min(len(lights), ha.fanout(MAX_STEPS))
+    size = math.ceil(len(lights) / steps)
+    return [lights[i:i + size] for i in range(0, len(lights), size)]
 
-    while _running:
-        # ---- WAVE ON ----
-        for entity_id in lights:
-            if not _running:
-                return
-            ha.turn_on(entity_id)
-            time.sleep(WAVE_DELAY)
 
-        time.sleep(HOLD_TIME)
+def _step(ha, lights, bands, i, on):
+    # one band per step; after the last one, hold then sweep the other way
+    if i < len(bands):
+        band = bands[i]
+        delay = WAVE_DELAY * len(band)  # a sweep takes as long as before
+        ha.apply({e: on for e in band},
+                 transition=delay if len(band) > 1 else None)
+        ha.effect.call_later(ha.pace(delay), _step, ha, lights, bands, i + 1, on)
+    else:
+        ha.effect.call_later(ha.pace(HOLD_TIME), _step, ha, lights,
+                             _bands(ha, lights), 0, not on)
 
-        # ---- WAVE OFF ----
-        for entity_id in lights:
-            if not _running:
-                return
-            ha.turn_off(entity_id)
-            time.sleep(WAVE_DELAY)
 
-        time.sleep(HOLD_TIME)
+def start(ha):
+    lights = ha.all_lights()
 
+    if not lights:
+        return
 
-def stop():
-    global _running
-    _running = False
-    time.sleep(0.2)
-    print("🛑 Wave stopped")
+    print("🌊 Wave started")
+    _step(ha, lights, _bands(ha, lights), 0, True)
 
 
-def run(ha):
-    global _running, _thread
+def stop(ha):
+    print("🛑 Wave stopped")
 
-    # toggle behavior
-    if _running:
-        stop()
-        return
 
-    print("🌊 Wave started")
-    _running = True
-
-    _thread = threading.Thread(
-        target=_wave_loop,
-        args=(ha,),
-        daemon=True
-    )
-    _thread.start()
+def is_running(ha):
+    return ha.effect.running